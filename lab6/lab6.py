@@ -1,37 +1,237 @@
+import csv
 import random
+import sys
 import time
+import tracemalloc
+from bisect import bisect_left
+from array import array
 import matplotlib.pyplot as plt
 
 class Node:
+    # Без __dict__ у каждого экземпляра: узел занимает в несколько раз меньше памяти
+    __slots__ = ('key', 'left', 'right', 'height', 'size')
+
     def __init__(self, key):
         self.key = key
         self.left = None
         self.right = None
         self.height = 1  # Для AVL дерева
+        self.size = 1  # Число узлов в поддереве (для rank/select)
+
+def _build_balanced(keys, lo, hi):
+    """Идеально сбалансированное дерево из отсортированного среза keys[lo:hi] за O(n)."""
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    node = Node(keys[mid])
+    node.left = _build_balanced(keys, lo, mid)
+    node.right = _build_balanced(keys, mid + 1, hi)
+    hl = node.left.height if node.left is not None else 0
+    hr = node.right.height if node.right is not None else 0
+    node.height = 1 + (hl if hl > hr else hr)
+    node.size = hi - lo
+    return node
+
+def _merge_sorted(a, b):
+    """Объединение двух отсортированных списков без повторов за O(len(a) + len(b))."""
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] < b[j]:
+            result.append(a[i])
+            i += 1
+        elif b[j] < a[i]:
+            result.append(b[j])
+            j += 1
+        else:
+            result.append(a[i])
+            i += 1
+            j += 1
+    result.extend(a[i:])
+    result.extend(b[j:])
+    return result
+
+def _intersect_sorted(a, b):
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] < b[j]:
+            i += 1
+        elif b[j] < a[i]:
+            j += 1
+        else:
+            result.append(a[i])
+            i += 1
+            j += 1
+    return result
+
+def _subtract_sorted(a, b):
+    result = []
+    j = 0
+    for key in a:
+        while j < len(b) and b[j] < key:
+            j += 1
+        if j == len(b) or b[j] != key:
+            result.append(key)
+    return result
+
+def _unique_sorted(keys):
+    result = []
+    for key in sorted(keys):
+        if not result or result[-1] != key:
+            result.append(key)
+    return result
+
+class BulkOpsMixin:
+    """
+    Пакетные и упорядоченные операции для BST и AVLTree. Большой пакет
+    сливается с ключами дерева (обход in-order) и дерево перестраивается за
+    линейное время; маленький пакет (k * log n < n) вставляется/удаляется по
+    одному ключу. Размеры поддеревьев в узлах дают rank/select за O(h).
+    """
+
+    def __iter__(self):
+        """Ленивый обход ключей по возрастанию, O(h) памяти."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    def range(self, lo, hi):
+        """Ленивый обход ключей из отрезка [lo, hi] за O(h + k): поддеревья вне отрезка не посещаются."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                if node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.key > hi:
+                return
+            yield node.key
+            node = node.right
+
+    def rank(self, key):
+        """Количество ключей, меньших key."""
+        result = 0
+        node = self.root
+        while node is not None:
+            if key <= node.key:
+                node = node.left
+            else:
+                result += 1 + (node.left.size if node.left is not None else 0)
+                node = node.right
+        return result
+
+    def select(self, k):
+        """k-й по возрастанию ключ (нумерация с нуля)."""
+        if not 0 <= k < len(self):
+            raise IndexError("select index out of range")
+        node = self.root
+        while True:
+            left_size = node.left.size if node.left is not None else 0
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.key
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    @classmethod
+    def from_sorted(cls, keys):
+        """Сбалансированное дерево из отсортированной последовательности ключей за O(n)."""
+        tree = cls()
+        unique = []
+        for key in keys:
+            if not unique or unique[-1] != key:
+                unique.append(key)
+        tree._rebuild(unique)
+        return tree
+
+    def _rebuild(self, keys):
+        self.root = _build_balanced(keys, 0, len(keys))
+        self.count = len(keys)
+
+    def _inorder_keys(self):
+        """Все ключи в порядке возрастания."""
+        return list(self)
+
+    def _prefers_rebuild(self, batch_size):
+        """Перестройка за O(n + k) выгоднее k одиночных операций по O(log n)."""
+        return batch_size * (len(self) + 1).bit_length() >= len(self)
+
+    def insert_many(self, keys):
+        batch = _unique_sorted(keys)
+        if not self._prefers_rebuild(len(batch)):
+            for key in batch:
+                self.insert(key)
+            return
+        self._rebuild(_merge_sorted(self._inorder_keys(), batch))
+
+    def delete_many(self, keys):
+        batch = _unique_sorted(keys)
+        if not self._prefers_rebuild(len(batch)):
+            for key in batch:
+                self.delete(key)
+            return
+        self._rebuild(_subtract_sorted(self._inorder_keys(), batch))
+
+    def union(self, other):
+        """Новое дерево с ключами обоих деревьев, за O(n + m)."""
+        tree = type(self)()
+        tree._rebuild(_merge_sorted(self._inorder_keys(), other._inorder_keys()))
+        return tree
 
-class BST:
+    def intersection(self, other):
+        """Новое дерево с общими ключами двух деревьев, за O(n + m)."""
+        tree = type(self)()
+        tree._rebuild(_intersect_sorted(self._inorder_keys(), other._inorder_keys()))
+        return tree
+
+class BST(BulkOpsMixin):
     def __init__(self):
         self.root = None
+        self.count = 0
+
+    def __len__(self):
+        return self.count
 
     def insert(self, key):
         if self.root is None:
             self.root = Node(key)
+            self.count = 1
             return
         
+        path = []
         current = self.root
         while True:
+            path.append(current)
             if key < current.key:
                 if current.left is None:
                     current.left = Node(key)
-                    return
+                    break
                 current = current.left
             elif key > current.key:
                 if current.right is None:
                     current.right = Node(key)
-                    return
+                    break
                 current = current.right
             else:
                 return  # Дубликаты не вставляем
+        self.count += 1
+        for node in path:
+            node.size += 1
 
     def search(self, key):
         current = self.root
@@ -47,10 +247,12 @@ class BST:
     def delete(self, key):
         parent = None
         current = self.root
+        path = []  # Предки физически удаляемого узла: у них размер уменьшится
         
         # Поиск удаляемого узла
         while current is not None and current.key != key:
             parent = current
+            path.append(current)
             if key < current.key:
                 current = current.left
             else:
@@ -58,6 +260,7 @@ class BST:
         
         if current is None:
             return  # Узел не найден
+        self.count -= 1
         
         # Случай 1: У узла нет детей или только один ребенок
         if current.left is None or current.right is None:
@@ -72,10 +275,12 @@ class BST:
                     parent.right = new_child
         else:
             # Случай 2: У узла два ребенка
+            path.append(current)
             successor_parent = current
             successor = current.right
             while successor.left is not None:
                 successor_parent = successor
+                path.append(successor)
                 successor = successor.left
             
             current.key = successor.key
@@ -83,51 +288,55 @@ class BST:
                 successor_parent.left = successor.right
             else:
                 successor_parent.right = successor.right
+        for node in path:
+            node.size -= 1
 
-class AVLTree:
+class AVLTree(BulkOpsMixin):
     def __init__(self):
         self.root = None
+        self.count = 0
 
-    def insert(self, key):
-        self.root = self._insert(self.root, key)
+    def __len__(self):
+        return self.count
 
-    def _insert(self, node, key):
-        if node is None:
-            return Node(key)
-        
-        if key < node.key:
-            node.left = self._insert(node.left, key)
-        elif key > node.key:
-            node.right = self._insert(node.right, key)
+    def insert(self, key):
+        # Спуск с запоминанием пути вместо рекурсии
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return  # Дубликаты не вставляем
+        new = Node(key)
+        self.count += 1
+        if not path:
+            self.root = new
+            return
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new
         else:
-            return node  # Дубликаты не вставляем
-        
-        # Обновление высоты
-        node.height = 1 + max(self._get_height(node.left),
-                            self._get_height(node.right))
-        
-        # Балансировка
-        balance = self._get_balance(node)
-        
-        # Left Left
-        if balance > 1 and key < node.left.key:
-            return self._right_rotate(node)
-        
-        # Right Right
-        if balance < -1 and key > node.right.key:
-            return self._left_rotate(node)
-        
-        # Left Right
-        if balance > 1 and key > node.left.key:
-            node.left = self._left_rotate(node.left)
-            return self._right_rotate(node)
-        
-        # Right Left
-        if balance < -1 and key < node.right.key:
-            node.right = self._right_rotate(node.right)
-            return self._left_rotate(node)
-        
-        return node
+            parent.right = new
+        for node in path:
+            node.size += 1
+
+        # Подъём по пути: после поворота высота поддерева восстанавливается,
+        # а если высота узла не изменилась, выше ничего не меняется
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            hl = node.left.height if node.left is not None else 0
+            hr = node.right.height if node.right is not None else 0
+            if hl - hr > 1 or hr - hl > 1:
+                self._set_child(path[i - 1] if i else None, node, self._rebalance(node))
+                return
+            h = 1 + (hl if hl > hr else hr)
+            if h == node.height:
+                return
+            node.height = h
 
     def search(self, key):
         current = self.root
@@ -141,55 +350,71 @@ class AVLTree:
         return None
 
     def delete(self, key):
-        self.root = self._delete(self.root, key)
-
-    def _delete(self, node, key):
+        path = []
+        node = self.root
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
         if node is None:
-            return node
-        
-        if key < node.key:
-            node.left = self._delete(node.left, key)
-        elif key > node.key:
-            node.right = self._delete(node.right, key)
+            return  # Узел не найден
+        self.count -= 1
+
+        if node.left is not None and node.right is not None:
+            # Ключ преемника переносится в узел, удаляется сам преемник (один проход)
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.key = successor.key
+            node = successor
+        child = node.left if node.left is not None else node.right
+        self._set_child(path[-1] if path else None, node, child)
+        for node in path:
+            node.size -= 1
+
+        # Балансировка вверх по пути; остановка, когда высота поддерева не изменилась
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            hl = node.left.height if node.left is not None else 0
+            hr = node.right.height if node.right is not None else 0
+            old_height = 1 + (hl if hl > hr else hr)
+            if hl - hr > 1 or hr - hl > 1:
+                sub = self._rebalance(node)
+                self._set_child(path[i - 1] if i else None, node, sub)
+                if sub.height == old_height:
+                    return
+                continue
+            if old_height == node.height:
+                return
+            node.height = old_height
+
+    def _set_child(self, parent, old, new):
+        """Заменяет ребёнка old узла parent на new (parent is None — корень)."""
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
         else:
-            if node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
-            
-            temp = self._min_value_node(node.right)
-            node.key = temp.key
-            node.right = self._delete(node.right, temp.key)
-        
-        if node is None:
-            return node
-        
-        # Обновление высоты
-        node.height = 1 + max(self._get_height(node.left),
-                            self._get_height(node.right))
-        
-        # Балансировка
-        balance = self._get_balance(node)
-        
-        # Left Left
-        if balance > 1 and self._get_balance(node.left) >= 0:
-            return self._right_rotate(node)
-        
-        # Left Right
-        if balance > 1 and self._get_balance(node.left) < 0:
-            node.left = self._left_rotate(node.left)
-            return self._right_rotate(node)
-        
-        # Right Right
-        if balance < -1 and self._get_balance(node.right) <= 0:
-            return self._left_rotate(node)
-        
+            parent.right = new
+
+    def _rebalance(self, z):
+        """Один или два поворота в узле z с дисбалансом 2; возвращает новый корень поддерева."""
+        left = z.left.height if z.left is not None else 0
+        right = z.right.height if z.right is not None else 0
+        if left > right:
+            y = z.left
+            # Left Right
+            if (y.left.height if y.left is not None else 0) < (y.right.height if y.right is not None else 0):
+                z.left = self._left_rotate(y)
+            # Left Left
+            return self._right_rotate(z)
+        y = z.right
         # Right Left
-        if balance < -1 and self._get_balance(node.right) > 0:
-            node.right = self._right_rotate(node.right)
-            return self._left_rotate(node)
-        
-        return node
+        if (y.right.height if y.right is not None else 0) < (y.left.height if y.left is not None else 0):
+            z.right = self._right_rotate(y)
+        # Right Right
+        return self._left_rotate(z)
 
     def _left_rotate(self, z):
         y = z.right
@@ -198,10 +423,13 @@ class AVLTree:
         y.left = z
         z.right = T2
         
-        z.height = 1 + max(self._get_height(z.left),
-                         self._get_height(z.right))
-        y.height = 1 + max(self._get_height(y.left),
-                         self._get_height(y.right))
+        hl = z.left.height if z.left is not None else 0
+        hr = T2.height if T2 is not None else 0
+        z.height = 1 + (hl if hl > hr else hr)
+        hr = y.right.height if y.right is not None else 0
+        y.height = 1 + (z.height if z.height > hr else hr)
+        y.size = z.size
+        z.size = 1 + (z.left.size if z.left is not None else 0) + (T2.size if T2 is not None else 0)
         
         return y
 
@@ -212,37 +440,675 @@ class AVLTree:
         x.right = y
         y.left = T2
         
-        y.height = 1 + max(self._get_height(y.left),
-                         self._get_height(y.right))
-        x.height = 1 + max(self._get_height(x.left),
-                         self._get_height(x.right))
+        hl = T2.height if T2 is not None else 0
+        hr = y.right.height if y.right is not None else 0
+        y.height = 1 + (hl if hl > hr else hr)
+        hl = x.left.height if x.left is not None else 0
+        x.height = 1 + (hl if hl > y.height else y.height)
+        x.size = y.size
+        y.size = 1 + (T2.size if T2 is not None else 0) + (y.right.size if y.right is not None else 0)
         
         return x
 
-    def _get_height(self, node):
-        if node is None:
-            return 0
-        return node.height
+class CompactAVLTree:
+    """
+    AVL-дерево на пуле узлов в виде параллельных массивов (struct-of-arrays):
+    keys, left, right, height. Узел — это индекс в массивах, индекс 0 — пустой
+    узел (высота 0). Ключи — целые числа (int64); по замеру tracemalloc узел
+    занимает ~17.5 байт против ~72 у объекта Node. search возвращает индекс
+    узла или None.
+    """
+
+    def __init__(self):
+        self.keys = array('q', [0])
+        self.left = array('i', [0])
+        self.right = array('i', [0])
+        self.height = bytearray(1)
+        self.free = []  # Освобождённые индексы для повторного использования
+        self.root = 0
+
+    def __len__(self):
+        return len(self.keys) - 1 - len(self.free)
+
+    def __iter__(self):
+        """Ленивый обход ключей по возрастанию, O(h) памяти."""
+        keys, left, right = self.keys, self.left, self.right
+        stack = []
+        x = self.root
+        while stack or x:
+            while x:
+                stack.append(x)
+                x = left[x]
+            x = stack.pop()
+            yield keys[x]
+            x = right[x]
+
+    def _new_node(self, key):
+        if self.free:
+            x = self.free.pop()
+            self.keys[x] = key
+            self.left[x] = self.right[x] = 0
+            self.height[x] = 1
+            return x
+        self.keys.append(key)
+        self.left.append(0)
+        self.right.append(0)
+        self.height.append(1)
+        return len(self.keys) - 1
+
+    def search(self, key):
+        keys, left, right = self.keys, self.left, self.right
+        x = self.root
+        while x:
+            k = keys[x]
+            if key == k:
+                return x
+            x = left[x] if key < k else right[x]
+        return None
+
+    def insert(self, key):
+        keys, left, right, height = self.keys, self.left, self.right, self.height
+        path = []
+        x = self.root
+        while x:
+            path.append(x)
+            k = keys[x]
+            if key < k:
+                x = left[x]
+            elif key > k:
+                x = right[x]
+            else:
+                return  # Дубликаты не вставляем
+        new = self._new_node(key)
+        if not path:
+            self.root = new
+            return
+        parent = path[-1]
+        if key < keys[parent]:
+            left[parent] = new
+        else:
+            right[parent] = new
+        # Подъём по пути: после одного поворота высота поддерева восстанавливается
+        for i in range(len(path) - 1, -1, -1):
+            x = path[i]
+            hl, hr = height[left[x]], height[right[x]]
+            if hl - hr > 1 or hr - hl > 1:
+                self._set_child(path[i - 1] if i else 0, x, self._rebalance(x))
+                return
+            h = 1 + (hl if hl > hr else hr)
+            if h == height[x]:
+                return
+            height[x] = h
+
+    def delete(self, key):
+        keys, left, right, height = self.keys, self.left, self.right, self.height
+        path = []
+        x = self.root
+        while x and keys[x] != key:
+            path.append(x)
+            x = left[x] if key < keys[x] else right[x]
+        if not x:
+            return  # Узел не найден
+        if left[x] and right[x]:
+            # Ключ преемника переносится в узел, удаляется сам преемник
+            path.append(x)
+            succ = right[x]
+            while left[succ]:
+                path.append(succ)
+                succ = left[succ]
+            keys[x] = keys[succ]
+            x = succ
+        self._set_child(path[-1] if path else 0, x, left[x] if left[x] else right[x])
+        self.free.append(x)
+        for i in range(len(path) - 1, -1, -1):
+            x = path[i]
+            hl, hr = height[left[x]], height[right[x]]
+            if hl - hr > 1 or hr - hl > 1:
+                sub = self._rebalance(x)
+                self._set_child(path[i - 1] if i else 0, x, sub)
+                if height[sub] == 1 + (hl if hl > hr else hr):
+                    return
+                continue
+            h = 1 + (hl if hl > hr else hr)
+            if h == height[x]:
+                return
+            height[x] = h
+
+    def _set_child(self, parent, old, new):
+        """Заменяет ребёнка old узла parent на new (parent == 0 — корень)."""
+        if parent == 0:
+            self.root = new
+        elif self.left[parent] == old:
+            self.left[parent] = new
+        else:
+            self.right[parent] = new
+
+    def _rebalance(self, z):
+        """Один или два поворота в узле z с дисбалансом 2; возвращает новый корень поддерева."""
+        left, right, height = self.left, self.right, self.height
+        if height[left[z]] > height[right[z]]:
+            y = left[z]
+            if height[left[y]] < height[right[y]]:
+                left[z] = self._left_rotate(y)
+            return self._right_rotate(z)
+        y = right[z]
+        if height[right[y]] < height[left[y]]:
+            right[z] = self._right_rotate(y)
+        return self._left_rotate(z)
+
+    def _left_rotate(self, z):
+        left, right, height = self.left, self.right, self.height
+        y = right[z]
+        right[z] = left[y]
+        left[y] = z
+        hl, hr = height[left[z]], height[right[z]]
+        height[z] = 1 + (hl if hl > hr else hr)
+        hl, hr = height[left[y]], height[right[y]]
+        height[y] = 1 + (hl if hl > hr else hr)
+        return y
+
+    def _right_rotate(self, z):
+        left, right, height = self.left, self.right, self.height
+        y = left[z]
+        left[z] = right[y]
+        right[y] = z
+        hl, hr = height[left[z]], height[right[z]]
+        height[z] = 1 + (hl if hl > hr else hr)
+        hl, hr = height[left[y]], height[right[y]]
+        height[y] = 1 + (hl if hl > hr else hr)
+        return y
+
+class SortedArray:
+    """Отсортированный массив на bisect: поиск O(log n), вставка и удаление O(n) сдвигом в C."""
+
+    def __init__(self):
+        self.keys = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def insert(self, key):
+        keys = self.keys
+        i = bisect_left(keys, key)
+        if i == len(keys) or keys[i] != key:
+            keys.insert(i, key)
+
+    def search(self, key):
+        keys = self.keys
+        i = bisect_left(keys, key)
+        if i != len(keys) and keys[i] == key:
+            return key
+        return None
+
+    def delete(self, key):
+        keys = self.keys
+        i = bisect_left(keys, key)
+        if i != len(keys) and keys[i] == key:
+            del keys[i]
+
+class SortedChunkList:
+    """
+    Упорядоченное множество в виде списка отсортированных блоков (аналог B-дерева
+    высоты 2): maxes хранит максимум каждого блока, блок ищется bisect по maxes,
+    ключ — bisect внутри блока. Сдвиги в блоке ограничены 2 * load элементами,
+    переполненный блок делится пополам.
+    """
+
+    def __init__(self, load=512):
+        self.load = load
+        self.chunks = []
+        self.maxes = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield from chunk
+
+    def insert(self, key):
+        maxes = self.maxes
+        if not maxes:
+            self.chunks.append([key])
+            maxes.append(key)
+            self.count = 1
+            return
+        pos = bisect_left(maxes, key)
+        if pos == len(maxes):
+            # Ключ больше всех: дописываем в последний блок
+            pos -= 1
+            chunk = self.chunks[pos]
+            chunk.append(key)
+            maxes[pos] = key
+        else:
+            chunk = self.chunks[pos]
+            i = bisect_left(chunk, key)
+            if chunk[i] == key:
+                return  # Дубликаты не вставляем
+            chunk.insert(i, key)
+        self.count += 1
+        if len(chunk) > 2 * self.load:
+            half = chunk[self.load:]
+            del chunk[self.load:]
+            self.chunks.insert(pos + 1, half)
+            maxes.insert(pos, chunk[-1])
+
+    def search(self, key):
+        maxes = self.maxes
+        pos = bisect_left(maxes, key)
+        if pos == len(maxes):
+            return None
+        chunk = self.chunks[pos]
+        i = bisect_left(chunk, key)
+        if chunk[i] == key:
+            return key
+        return None
+
+    def delete(self, key):
+        maxes = self.maxes
+        pos = bisect_left(maxes, key)
+        if pos == len(maxes):
+            return
+        chunk = self.chunks[pos]
+        i = bisect_left(chunk, key)
+        if chunk[i] != key:
+            return
+        del chunk[i]
+        self.count -= 1
+        if not chunk:
+            del self.chunks[pos]
+            del maxes[pos]
+        elif i == len(chunk):
+            maxes[pos] = chunk[-1]
+
+class SplayTree:
+    """
+    Самонастраивающееся дерево: каждая операция поднимает найденный ключ в корень
+    (нисходящий splay без рекурсии), поэтому часто запрашиваемые ключи остаются
+    у корня и поиск по ним стоит амортизированно O(1).
+    """
+
+    def __init__(self):
+        self.root = None
+        self.count = 0
+        self._header = Node(None)  # Вспомогательный узел для сборки левого и правого деревьев
+
+    def __len__(self):
+        return self.count
+
+    def _splay(self, key):
+        """Поднимает в корень узел с ключом key или последний узел на пути поиска."""
+        t = self.root
+        if t is None:
+            return
+        header = self._header
+        header.left = header.right = None
+        l = r = header
+        while True:
+            if key < t.key:
+                if t.left is None:
+                    break
+                if key < t.left.key:
+                    # Zig-zig: поворот вправо
+                    y = t.left
+                    t.left = y.right
+                    y.right = t
+                    t = y
+                    if t.left is None:
+                        break
+                r.left = t
+                r = t
+                t = t.left
+            elif key > t.key:
+                if t.right is None:
+                    break
+                if key > t.right.key:
+                    # Zag-zag: поворот влево
+                    y = t.right
+                    t.right = y.left
+                    y.left = t
+                    t = y
+                    if t.right is None:
+                        break
+                l.right = t
+                l = t
+                t = t.right
+            else:
+                break
+        l.right = t.left
+        r.left = t.right
+        t.left = header.right
+        t.right = header.left
+        self.root = t
+
+    def insert(self, key):
+        if self.root is None:
+            self.root = Node(key)
+            self.count = 1
+            return
+        self._splay(key)
+        root = self.root
+        if key == root.key:
+            return  # Дубликаты не вставляем
+        node = Node(key)
+        if key < root.key:
+            node.left = root.left
+            node.right = root
+            root.left = None
+        else:
+            node.right = root.right
+            node.left = root
+            root.right = None
+        self.root = node
+        self.count += 1
+
+    def search(self, key):
+        self._splay(key)
+        if self.root is not None and self.root.key == key:
+            return self.root
+        return None
+
+    def delete(self, key):
+        self._splay(key)
+        root = self.root
+        if root is None or root.key != key:
+            return  # Узел не найден
+        self.count -= 1
+        if root.left is None:
+            self.root = root.right
+        else:
+            right = root.right
+            # key больше всех ключей левого поддерева: splay поднимает его максимум
+            self.root = root.left
+            self._splay(key)
+            self.root.right = right
+
+class TreapNode(Node):
+    __slots__ = ('priority',)
+
+    def __init__(self, key, priority):
+        super().__init__(key)
+        self.priority = priority
 
-    def _get_balance(self, node):
+class Treap:
+    """
+    Декартово дерево: BST по ключам и min-куча по случайным приоритетам,
+    ожидаемая глубина O(log n) независимо от порядка вставки.
+    rng — источник приоритетов (random.Random(seed) для воспроизводимой формы дерева).
+    """
+
+    def __init__(self, rng=None):
+        self.root = None
+        self.count = 0
+        self.rng = rng if rng is not None else random
+
+    def __len__(self):
+        return self.count
+
+    def _set_child(self, parent, old, new):
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def insert(self, key):
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return  # Дубликаты не вставляем
+        new = TreapNode(key, self.rng.random())
+        self.count += 1
+        if not path:
+            self.root = new
+            return
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new
+        else:
+            parent.right = new
+        # Поворотами поднимаем новый узел, пока не восстановится свойство кучи
+        while path:
+            parent = path.pop()
+            if parent.priority <= new.priority:
+                break
+            if parent.left is new:
+                parent.left = new.right
+                new.right = parent
+            else:
+                parent.right = new.left
+                new.left = parent
+            self._set_child(path[-1] if path else None, parent, new)
+
+    def search(self, key):
+        current = self.root
+        while current is not None:
+            if key == current.key:
+                return current
+            elif key < current.key:
+                current = current.left
+            else:
+                current = current.right
+        return None
+
+    def delete(self, key):
+        parent = None
+        node = self.root
+        while node is not None and node.key != key:
+            parent = node
+            node = node.left if key < node.key else node.right
         if node is None:
-            return 0
-        return self._get_height(node.left) - self._get_height(node.right)
+            return  # Узел не найден
+        self.count -= 1
+        # Опускаем узел поворотами к ребёнку с меньшим приоритетом, пока у него два ребёнка
+        while node.left is not None and node.right is not None:
+            if node.left.priority < node.right.priority:
+                child = node.left
+                node.left = child.right
+                child.right = node
+            else:
+                child = node.right
+                node.right = child.left
+                child.left = node
+            self._set_child(parent, node, child)
+            parent = child
+        self._set_child(parent, node, node.left if node.left is not None else node.right)
+
+# Структуры, сравниваемые в run_tests (кроме неупорядоченного списка Array)
+ORDERED_SETS = {
+    'BST': BST,
+    'AVL': AVLTree,
+    'CompactAVL': CompactAVLTree,
+    'SortedArray': SortedArray,
+    'Chunks': SortedChunkList,
+    'Splay': SplayTree,
+    'Treap': Treap,
+}
+
+def zipf_keys(keys, count, s=1.1, rng=random):
+    """
+    count запросов к keys с распределением Ципфа: ключ ранга i (в случайном
+    порядке) запрашивается с вероятностью ~ 1 / i^s, т.е. немногие ключи «горячие».
+    rng — источник случайности (модуль random или random.Random(seed)).
+    """
+    ranked = sorted(set(keys))
+    rng.shuffle(ranked)
+    weights = [1 / (i + 1) ** s for i in range(len(ranked))]
+    return rng.choices(ranked, weights=weights, k=count)
+
+WORKLOADS = ('sorted', 'reverse', 'random', 'zipf', 'mixed')
+
+def make_workload(profile, size, ops=10000, read_ratio=0.9, rng=random):
+    """
+    Именованный профиль нагрузки: (ключи для заполнения в порядке вставки, операции).
+    sorted/reverse/random — порядок вставки, затем равномерный поиск; zipf — поиск
+    с распределением Ципфа; mixed — доля read_ratio поисков, остальное вставки и удаления.
+    """
+    if profile == 'sorted':
+        load = list(range(size))
+    elif profile == 'reverse':
+        load = list(range(size - 1, -1, -1))
+    elif profile in ('random', 'zipf', 'mixed'):
+        load = rng.sample(range(size * 10), size)
+    else:
+        raise ValueError(f"Unknown workload profile: {profile}")
+
+    if profile == 'zipf':
+        operations = [('search', key) for key in zipf_keys(load, ops, rng=rng)]
+    elif profile == 'mixed':
+        operations = []
+        for _ in range(ops):
+            if rng.random() < read_ratio:
+                operations.append(('search', load[rng.randrange(size)]))
+            elif rng.random() < 0.5:
+                operations.append(('insert', rng.randrange(size * 10)))
+            else:
+                operations.append(('delete', load[rng.randrange(size)]))
+    else:
+        operations = [('search', load[rng.randrange(size)]) for _ in range(ops)]
+    return load, operations
+
+def percentile(sorted_values, q):
+    """Перцентиль q (0..100) отсортированной выборки с линейной интерполяцией."""
+    if not sorted_values:
+        return float('nan')
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+def latency_summary(samples):
+    """Статистика задержек (нс) и гистограмма по степеням двойки: {верхняя граница: число}."""
+    values = sorted(samples)
+    histogram = {}
+    for v in values:
+        bucket = 1 << max(v, 1).bit_length()
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+    return {
+        'ops': len(values),
+        'mean_ns': sum(values) / len(values),
+        'p50_ns': percentile(values, 50),
+        'p99_ns': percentile(values, 99),
+        'max_ns': values[-1],
+    }, histogram
+
+def tree_height(tree):
+    """Высота дерева из узлов Node (или CompactAVLTree); None для структур без дерева узлов."""
+    if isinstance(tree, CompactAVLTree):
+        return tree.height[tree.root]
+    root = getattr(tree, 'root', None)
+    if not isinstance(root, Node):
+        return None
+    height = 0
+    level = [root]
+    while level:
+        height += 1
+        level = [c for node in level for c in (node.left, node.right) if c is not None]
+    return height
 
-    def _min_value_node(self, node):
-        current = node
-        while current.left is not None:
-            current = current.left
-        return current
+def _too_slow(ds, profile, size):
+    """Комбинации с квадратичным временем, которые не имеет смысла запускать на больших N."""
+    if ds == 'BST' and profile in ('sorted', 'reverse'):
+        return size > 2**14
+    if ds == 'SortedArray' and profile != 'sorted':
+        return size > 2**17
+    return False
 
-def run_tests():
+BENCHMARK_FIELDS = ['profile', 'size', 'structure', 'phase', 'ops', 'mean_ns', 'p50_ns', 'p99_ns',
+                    'max_ns', 'height', 'bytes_per_key']
+HISTOGRAM_FIELDS = ['profile', 'size', 'structure', 'phase', 'bucket_ns', 'count']
+
+def _new_set(ds, seed):
+    """Пустая структура ds; рандомизированные структуры получают генератор от seed."""
+    cls = ORDERED_SETS[ds]
+    if cls is Treap:
+        return cls(rng=random.Random(seed))
+    return cls()
+
+def run_benchmark(profiles=WORKLOADS, sizes=(10**3, 10**4, 10**5, 10**6), structures=None,
+                  ops=10000, seed=0, filename='benchmark.csv', histogram_filename='benchmark_histogram.csv'):
+    """
+    Бенчмарк по профилям нагрузки: задержка каждой операции через perf_counter_ns
+    (p50/p99/max и гистограмма), высота дерева после заполнения и память на ключ
+    (отдельный прогон под tracemalloc). Результаты сохраняются в CSV.
+    """
+    structures = list(structures or ORDERED_SETS)
+    rows = []
+    histograms = []
+    for profile in profiles:
+        for size in sizes:
+            load, operations = make_workload(profile, size, ops, rng=random.Random(seed + size))
+            for ds in structures:
+                if _too_slow(ds, profile, size):
+                    print(f"  skip {ds} on {profile} N={size}")
+                    continue
+                tracemalloc.start()
+                tree = _new_set(ds, seed + size)
+                for key in load:
+                    tree.insert(key)
+                memory = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                del tree
+
+                clock = time.perf_counter_ns
+                tree = _new_set(ds, seed + size)
+                insert = tree.insert
+                build = []
+                for key in load:
+                    t0 = clock()
+                    insert(key)
+                    build.append(clock() - t0)
+                height = tree_height(tree)
+
+                samples = {'search': [], 'insert': [], 'delete': []}
+                methods = {'search': tree.search, 'insert': tree.insert, 'delete': tree.delete}
+                for op, key in operations:
+                    method = methods[op]
+                    t0 = clock()
+                    method(key)
+                    samples[op].append(clock() - t0)
+
+                for phase, values in [('build', build)] + list(samples.items()):
+                    if not values:
+                        continue
+                    stats, histogram = latency_summary(values)
+                    rows.append({'profile': profile, 'size': size, 'structure': ds, 'phase': phase, **stats,
+                                 'height': height if height is not None else '',
+                                 'bytes_per_key': memory / size})
+                    for bucket, count in sorted(histogram.items()):
+                        histograms.append({'profile': profile, 'size': size, 'structure': ds, 'phase': phase,
+                                           'bucket_ns': bucket, 'count': count})
+                    print(f"{profile:>7} N={size:<8} {ds:<12} {phase:<7} p50={stats['p50_ns']:.0f}ns "
+                          f"p99={stats['p99_ns']:.0f}ns height={height} bytes/key={memory / size:.1f}")
+
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=BENCHMARK_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(histogram_filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=HISTOGRAM_FIELDS)
+        writer.writeheader()
+        writer.writerows(histograms)
+    print(f"Results saved to {filename} and {histogram_filename}")
+    return rows
+
+def run_tests(access='uniform'):
+    """access='zipf' — поисковые запросы с распределением Ципфа вместо равномерного."""
     repeats = 2
     sizes = [2**(8+i) for i in range(12)]  # От 256 до 8192 элементов
-    results = {
-        'insert': {'BST': [], 'AVL': [], 'Array': []},
-        'search': {'BST': [], 'AVL': [], 'Array': []},
-        'delete': {'BST': [], 'AVL': [], 'Array': []}
-    }
+    structures = list(ORDERED_SETS) + ['Array']
+    results = {op: {ds: [] for ds in structures} for op in ('insert', 'search', 'delete')}
 
     for size in sizes:
         print(f"\nTesting size: {size}")
@@ -264,15 +1130,11 @@ def run_tests():
             random.shuffle(data)  # Для BST важно не передавать отсортированные данные
             
             # Тестирование вставки
-            for ds in ['BST', 'AVL', 'Array']:
+            for ds in structures:
                 start = time.time()
                 
-                if ds == 'BST':
-                    tree = BST()
-                    for num in data:
-                        tree.insert(num)
-                elif ds == 'AVL':
-                    tree = AVLTree()
+                if ds in ORDERED_SETS:
+                    tree = ORDERED_SETS[ds]()
                     for num in data:
                         tree.insert(num)
                 else:  # Array
@@ -283,25 +1145,25 @@ def run_tests():
                 results['insert'][ds][-1] += (time.time() - start)/repeats
             
             # Подготовка структур для тестов поиска/удаления
-            bst = BST()
-            avl = AVLTree()
+            trees = {ds: ORDERED_SETS[ds]() for ds in ORDERED_SETS}
             arr = []
             for num in data:
-                bst.insert(num)
-                avl.insert(num)
+                for tree in trees.values():
+                    tree.insert(num)
                 arr.append(num)
             
             # Тестирование поиска (1000 операций)
-            search_keys = random.sample(data, min(1000, size))
-            for ds in ['BST', 'AVL', 'Array']:
+            if access == 'zipf':
+                search_keys = zipf_keys(data, 1000)
+            else:
+                search_keys = random.sample(data, min(1000, size))
+            for ds in structures:
                 start = time.time()
                 
-                if ds == 'BST':
-                    for key in search_keys:
-                        bst.search(key)
-                elif ds == 'AVL':
+                if ds in trees:
+                    tree = trees[ds]
                     for key in search_keys:
-                        avl.search(key)
+                        tree.search(key)
                 else:  # Array
                     for key in search_keys:
                         key in arr
@@ -311,15 +1173,13 @@ def run_tests():
             
             # Тестирование удаления (1000 операций)
             delete_keys = random.sample(data, min(1000, size))
-            for ds in ['BST', 'AVL', 'Array']:
+            for ds in structures:
                 start = time.time()
                 
-                if ds == 'BST':
-                    for key in delete_keys:
-                        bst.delete(key)
-                elif ds == 'AVL':
+                if ds in trees:
+                    tree = trees[ds]
                     for key in delete_keys:
-                        avl.delete(key)
+                        tree.delete(key)
                 else:  # Array
                     arr_copy = arr.copy()
                     for key in delete_keys:
@@ -333,7 +1193,7 @@ def run_tests():
     operations = ['insert', 'search', 'delete']
     for op in operations:
         plt.figure(figsize=(10, 6))
-        for ds in ['BST', 'AVL', 'Array']:
+        for ds in structures:
             plt.plot(sizes, results[op][ds], label=ds, marker='o')
         
         plt.xscale('log')
@@ -343,11 +1203,16 @@ def run_tests():
         plt.title(f'{op.capitalize()} performance comparison')
         plt.legend()
         plt.grid(True)
-        plt.savefig(f'{op}_performance.png')
+        suffix = '' if access == 'uniform' else f'_{access}'
+        plt.savefig(f'{op}_performance{suffix}.png')
         plt.close()
 
     print("\nTesting completed!")
-    print("Graphs saved as: insert_performance.png, search_performance.png, delete_performance.png")
+    print(f"Graphs saved as: insert_performance{suffix}.png, search_performance{suffix}.png, "
+          f"delete_performance{suffix}.png")
 
 if __name__ == '__main__':
-    run_tests()
\ No newline at end of file
+    if '--bench' in sys.argv:
+        run_benchmark()
+    else:
+        run_tests('zipf' if '--zipf' in sys.argv else 'uniform')
\ No newline at end of file
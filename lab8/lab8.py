@@ -0,0 +1,702 @@
+import gc
+import random
+import time
+import csv
+import matplotlib.pyplot as plt
+
+
+class BinaryHeap:
+    """
+    d-арная min-куча на плоских списках (arity=2 — обычная двоичная, 4-арная
+    в CPython обычно быстрее: дерево ниже, а сравнения детей дешёвые).
+    В куче лежат номера элементов; ключ, значение и позиция элемента хранятся
+    в списках по номеру, поэтому insert возвращает номер-дескриптор, по которому
+    работает decrease_key.
+    """
+
+    def __init__(self, arity=2):
+        self.arity = arity
+        self.heap = []   # Номера элементов в порядке кучи
+        self.keys = []   # Ключ по номеру
+        self.values = []  # Значение по номеру
+        self.pos = []    # Позиция номера в heap (-1 — элемент удалён)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def insert(self, key, value=None):
+        handle = len(self.keys)
+        self.keys.append(key)
+        self.values.append(value)
+        self.pos.append(len(self.heap))
+        self.heap.append(handle)
+        self._sift_up(len(self.heap) - 1)
+        return handle
+
+    def find_min(self):
+        if not self.heap:
+            raise IndexError("find_min from empty heap")
+        top = self.heap[0]
+        return self.keys[top], self.values[top]
+
+    def delete_min(self):
+        heap = self.heap
+        if not heap:
+            raise IndexError("delete_min from empty heap")
+        top = heap[0]
+        last = heap.pop()
+        self.pos[top] = -1
+        if heap:
+            heap[0] = last
+            self.pos[last] = 0
+            self._sift_down(0)
+        return self.keys[top], self.values[top]
+
+    def decrease_key(self, handle, key):
+        if self.pos[handle] == -1:
+            raise KeyError("element is no longer in the heap")
+        if key > self.keys[handle]:
+            raise ValueError("new key is greater than current key")
+        self.keys[handle] = key
+        self._sift_up(self.pos[handle])
+
+    def merge(self, other):
+        """
+        Слияние с другой кучей за O(n + m) (построение кучи снизу вверх).
+        Элементы other получают новые дескрипторы: старые смещаются на
+        len(self.keys) до слияния; other после слияния пуста.
+        """
+        offset = len(self.keys)
+        self.keys.extend(other.keys)
+        self.values.extend(other.values)
+        self.pos.extend([-1] * len(other.pos))
+        self.heap.extend(handle + offset for handle in other.heap)
+        for i, handle in enumerate(self.heap):
+            self.pos[handle] = i
+        for i in range((len(self.heap) - 2) // self.arity, -1, -1):
+            self._sift_down(i)
+        other.__init__(other.arity)
+
+    def _sift_up(self, i):
+        heap, pos, keys, d = self.heap, self.pos, self.keys, self.arity
+        handle = heap[i]
+        key = keys[handle]
+        while i > 0:
+            parent = (i - 1) // d
+            p = heap[parent]
+            if keys[p] <= key:
+                break
+            heap[i] = p
+            pos[p] = i
+            i = parent
+        heap[i] = handle
+        pos[handle] = i
+
+    def _sift_down(self, i):
+        heap, pos, keys, d = self.heap, self.pos, self.keys, self.arity
+        n = len(heap)
+        handle = heap[i]
+        key = keys[handle]
+        while True:
+            first = i * d + 1
+            if first >= n:
+                break
+            best = first
+            best_key = keys[heap[first]]
+            for c in range(first + 1, min(first + d, n)):
+                ck = keys[heap[c]]
+                if ck < best_key:
+                    best, best_key = c, ck
+            if best_key >= key:
+                break
+            child = heap[best]
+            heap[i] = child
+            pos[child] = i
+            i = best
+        heap[i] = handle
+        pos[handle] = i
+
+
+class FibonacciNode:
+    __slots__ = ('key', 'value', 'parent', 'child', 'left', 'right', 'degree', 'mark')
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.parent = None
+        self.child = None
+        self.left = self
+        self.right = self
+        self.degree = 0  # -1 — узел удалён из кучи
+        self.mark = False
+
+
+class FibonacciHeap:
+    """
+    Фибоначчиева куча: insert, find_min, merge и амортизированно decrease_key
+    за O(1), delete_min — амортизированно O(log n). Корни и дети хранятся в
+    кольцевых двусвязных списках; consolidate выполняется без рекурсии.
+    insert возвращает узел, который служит дескриптором для decrease_key.
+    """
+
+    def __init__(self):
+        self.min = None
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    @staticmethod
+    def _splice(a, b):
+        """Склеивает два кольцевых списка, содержащих a и b."""
+        a_right = a.right
+        b_left = b.left
+        a.right = b
+        b.left = a
+        a_right.left = b_left
+        b_left.right = a_right
+
+    def insert(self, key, value=None):
+        node = FibonacciNode(key, value)
+        if self.min is None:
+            self.min = node
+        else:
+            self._splice(self.min, node)
+            if key < self.min.key:
+                self.min = node
+        self.n += 1
+        return node
+
+    def find_min(self):
+        if self.min is None:
+            raise IndexError("find_min from empty heap")
+        return self.min.key, self.min.value
+
+    def merge(self, other):
+        """Слияние за O(1): кольцевые списки корней склеиваются; other после слияния пуста."""
+        if other.min is None:
+            return
+        if self.min is None:
+            self.min = other.min
+        else:
+            self._splice(self.min, other.min)
+            if other.min.key < self.min.key:
+                self.min = other.min
+        self.n += other.n
+        other.min = None
+        other.n = 0
+
+    def delete_min(self):
+        z = self.min
+        if z is None:
+            raise IndexError("delete_min from empty heap")
+        # Дети минимума переходят в список корней
+        child = z.child
+        if child is not None:
+            node = child
+            while True:
+                node.parent = None
+                node = node.right
+                if node is child:
+                    break
+            self._splice(z, child)
+            z.child = None
+        # Удаление z из списка корней
+        if z.right is z:
+            self.min = None
+        else:
+            z.left.right = z.right
+            z.right.left = z.left
+            self.min = z.right
+            self._consolidate()
+        z.left = z.right = z
+        z.degree = -1
+        self.n -= 1
+        return z.key, z.value
+
+    def _consolidate(self):
+        roots = []
+        node = self.min
+        while True:
+            roots.append(node)
+            node = node.right
+            if node is self.min:
+                break
+        table = []
+        for x in roots:
+            d = x.degree
+            while True:
+                if d >= len(table):
+                    table.extend([None] * (d + 1 - len(table)))
+                y = table[d]
+                if y is None:
+                    break
+                if y.key < x.key:
+                    x, y = y, x
+                self._link(y, x)
+                table[d] = None
+                d += 1
+            table[d] = x
+        # Новый список корней из таблицы степеней
+        self.min = None
+        for x in table:
+            if x is None:
+                continue
+            x.left = x.right = x
+            if self.min is None:
+                self.min = x
+            else:
+                self._splice(self.min, x)
+                if x.key < self.min.key:
+                    self.min = x
+
+    def _link(self, y, x):
+        """Делает корень y ребёнком корня x."""
+        y.left.right = y.right
+        y.right.left = y.left
+        y.left = y.right = y
+        y.parent = x
+        if x.child is None:
+            x.child = y
+        else:
+            self._splice(x.child, y)
+        x.degree += 1
+        y.mark = False
+
+    def decrease_key(self, node, key):
+        if node.degree == -1:
+            raise KeyError("element is no longer in the heap")
+        if key > node.key:
+            raise ValueError("new key is greater than current key")
+        node.key = key
+        parent = node.parent
+        if parent is not None and key < parent.key:
+            self._cut(node, parent)
+            self._cascading_cut(parent)
+        if key < self.min.key:
+            self.min = node
+
+    def _cascading_cut(self, node):
+        """Каскадное вырезание вверх по помеченным предкам (без рекурсии)."""
+        parent = node.parent
+        while parent is not None:
+            if not node.mark:
+                node.mark = True
+                return
+            self._cut(node, parent)
+            node = parent
+            parent = node.parent
+
+    def _cut(self, node, parent):
+        """Переносит node из детей parent в список корней."""
+        if node.right is node:
+            parent.child = None
+        else:
+            if parent.child is node:
+                parent.child = node.right
+            node.left.right = node.right
+            node.right.left = node.left
+        parent.degree -= 1
+        node.left = node.right = node
+        node.parent = None
+        node.mark = False
+        self._splice(self.min, node)
+
+
+class PairingNode:
+    __slots__ = ('key', 'value', 'child', 'sibling', 'prev')
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.child = None    # Самый левый ребёнок
+        self.sibling = None  # Правый брат
+        self.prev = None     # Левый брат или родитель (для самого левого ребёнка)
+
+
+class PairingHeap:
+    """
+    Парная куча: insert, merge и decrease_key за O(1), delete_min —
+    амортизированно O(log n) через двухпроходное слияние детей (без рекурсии).
+    На практике обычно быстрее фибоначчиевой: узлы проще, ссылок меньше.
+    insert возвращает узел-дескриптор для decrease_key.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    @staticmethod
+    def _link(a, b):
+        """Сливает два корня: больший становится самым левым ребёнком меньшего."""
+        if b.key < a.key:
+            a, b = b, a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        b.prev = a
+        a.child = b
+        return a
+
+    def insert(self, key, value=None):
+        node = PairingNode(key, value)
+        self.root = node if self.root is None else self._link(self.root, node)
+        self.n += 1
+        return node
+
+    def find_min(self):
+        if self.root is None:
+            raise IndexError("find_min from empty heap")
+        return self.root.key, self.root.value
+
+    def merge(self, other):
+        """Слияние за O(1); other после слияния пуста."""
+        if other.root is not None:
+            self.root = other.root if self.root is None else self._link(self.root, other.root)
+            self.n += other.n
+            other.root = None
+            other.n = 0
+
+    def delete_min(self):
+        root = self.root
+        if root is None:
+            raise IndexError("delete_min from empty heap")
+        self.root = self._merge_pairs(root.child)
+        root.child = None
+        self.n -= 1
+        return root.key, root.value
+
+    def _merge_pairs(self, first):
+        """Двухпроходное слияние списка братьев: попарно слева направо, затем справа налево."""
+        pairs = []
+        node = first
+        while node is not None:
+            a = node
+            b = a.sibling
+            if b is None:
+                a.prev = None
+                pairs.append(a)
+                break
+            node = b.sibling
+            a.sibling = a.prev = b.sibling = b.prev = None
+            pairs.append(self._link(a, b))
+        if not pairs:
+            return None
+        root = pairs.pop()
+        while pairs:
+            root = self._link(pairs.pop(), root)
+        return root
+
+    def decrease_key(self, node, key):
+        # У любого узла кучи, кроме корня, есть prev; без него узел уже удалён
+        if node.prev is None and node is not self.root:
+            raise KeyError("element is no longer in the heap")
+        if key > node.key:
+            raise ValueError("new key is greater than current key")
+        node.key = key
+        if node is self.root:
+            return
+        # Вырезаем поддерево node и сливаем его с корнем
+        prev = node.prev
+        if prev.child is node:
+            prev.child = node.sibling
+        else:
+            prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = prev
+        node.prev = node.sibling = None
+        self.root = self._link(self.root, node)
+
+
+class RadixEntry:
+    __slots__ = ('key', 'value', 'bucket')
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.bucket = -1
+
+
+class RadixHeap:
+    """
+    Поразрядная (radix) куча для монотонных очередей с целыми ключами
+    0 <= key < 2**bits, как в алгоритме Дейкстры: новые ключи не меньше
+    последнего извлечённого минимума last. Элемент лежит в корзине с номером
+    (key ^ last).bit_length(); при опустошении корзины 0 первая непустая
+    корзина перераспределяется в младшие, так что каждый элемент перемещается
+    не более bits раз. Корзины — множества, поэтому decrease_key за O(1).
+    find_min не сдвигает last, а запоминает найденный минимум до изменения кучи.
+    insert возвращает запись-дескриптор для decrease_key.
+    """
+
+    def __init__(self, bits=64):
+        self.bits = bits
+        self.buckets = [set() for _ in range(bits + 1)]
+        self.last = 0
+        self.n = 0
+        self._min = None  # Запомненный минимум (None — неизвестен)
+
+    def __len__(self):
+        return self.n
+
+    def _check(self, key):
+        if key < self.last or key >> self.bits:
+            raise ValueError("key violates monotonicity or exceeds the key range")
+
+    def _put(self, entry):
+        entry.bucket = (entry.key ^ self.last).bit_length()
+        self.buckets[entry.bucket].add(entry)
+
+    def insert(self, key, value=None):
+        self._check(key)
+        entry = RadixEntry(key, value)
+        self._put(entry)
+        self.n += 1
+        if self._min is not None and key < self._min.key:
+            self._min = entry
+        return entry
+
+    def _pull(self):
+        """Гарантирует непустую корзину 0: сдвигает last на минимум первой непустой корзины."""
+        buckets = self.buckets
+        if buckets[0]:
+            return
+        if not self.n:
+            raise IndexError("heap is empty")
+        i = 1
+        while not buckets[i]:
+            i += 1
+        moved = buckets[i]
+        buckets[i] = set()
+        self.last = min(entry.key for entry in moved)
+        for entry in moved:
+            self._put(entry)
+
+    def find_min(self):
+        if not self.n:
+            raise IndexError("find_min from empty heap")
+        if self._min is None:
+            i = 0
+            while not self.buckets[i]:
+                i += 1
+            self._min = min(self.buckets[i], key=lambda entry: entry.key)
+        return self._min.key, self._min.value
+
+    def delete_min(self):
+        if not self.n:
+            raise IndexError("delete_min from empty heap")
+        self._pull()
+        entry = self.buckets[0].pop()
+        entry.bucket = -1
+        self.n -= 1
+        self._min = None
+        return entry.key, entry.value
+
+    def decrease_key(self, entry, key):
+        if entry.bucket == -1:
+            raise KeyError("element is no longer in the heap")
+        if key > entry.key:
+            raise ValueError("new key is greater than current key")
+        self._check(key)
+        self.buckets[entry.bucket].remove(entry)
+        entry.key = key
+        self._put(entry)
+        if self._min is not None and key < self._min.key:
+            self._min = entry
+
+    def merge(self, other):
+        """
+        Слияние за O(m): записи other перераспределяются по корзинам self
+        (их ключи должны быть не меньше self.last); дескрипторы сохраняются.
+        """
+        for bucket in other.buckets:
+            for entry in bucket:
+                self._check(entry.key)
+        for bucket in other.buckets:
+            for entry in bucket:
+                self._put(entry)
+            bucket.clear()
+        self.n += other.n
+        self._min = None
+        other.n = 0
+        other.last = 0
+        other._min = None
+
+
+HEAPS = {
+    'BinaryHeap': BinaryHeap,
+    'FibonacciHeap': FibonacciHeap,
+    'PairingHeap': PairingHeap,
+    'RadixHeap': RadixHeap,
+}
+
+
+KEY_RANGE = 1 << 32
+OPERATIONS = ['FindMin', 'DeleteMin', 'Insert', 'DecreaseKey', 'Merge']
+STATS = ['Avg', 'P50', 'P99', 'Max']
+
+
+def _noop(*args):
+    pass
+
+
+def _time_batch(func, batch):
+    """
+    Время (нс) вызовов func(*args) для всех args из batch. Сборщик мусора
+    на время замера отключается (как в timeit): иначе полный проход по
+    миллиону узлов кучи попадает в случайный пакет.
+    """
+    clock = time.perf_counter_ns
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = clock()
+        for args in batch:
+            func(*args)
+        return clock() - start
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _overhead(batch, repeats=5):
+    """Накладные расходы цикла и вызова на пакете такой же формы (минимум из repeats)."""
+    return min(_time_batch(_noop, batch) for _ in range(repeats))
+
+
+def percentile(sorted_values, q):
+    """Перцентиль q (0..100) отсортированной выборки с линейной интерполяцией."""
+    if not sorted_values:
+        return float('nan')
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def _summarize(samples, total_ns, total_ops):
+    """
+    Статистика в секундах на операцию: среднее по всем операциям, p50/p99/max
+    по пакетам. При числе выборок меньше 100 p99 неотличим от максимума,
+    поэтому вместо него пишется NaN.
+    """
+    values = sorted(samples)
+    p99 = percentile(values, 99) if len(values) >= 100 else float('nan')
+    return {'Avg': total_ns / total_ops / 1e9, 'P50': percentile(values, 50) / 1e9,
+            'P99': p99 / 1e9, 'Max': values[-1] / 1e9}
+
+
+def benchmark_heap(heap_cls, n, batch=20, rounds=500, merge_rounds=100, seed=0):
+    """
+    Замер операций кучи из n элементов пакетами по batch операций:
+    время пакета берётся через perf_counter_ns, из него вычитаются накладные
+    расходы пустого цикла той же формы, и делится на batch. Так получается
+    rounds выборок на операцию вместо квантованных замеров одиночных вызовов.
+    Merge — слияние с кучей из batch элементов, замеряется каждое слияние
+    (merge_rounds выборок: слияние двоичной кучи стоит O(n)). Нагрузка монотонная (как в алгоритме Дейкстры): ключи целые, и новые или
+    уменьшенные ключи не меньше текущего минимума — это допустимо для RadixHeap.
+    """
+    rng = random.Random(seed)
+    heap = heap_cls()
+    keys = [rng.randrange(KEY_RANGE) for _ in range(n)]
+    handles = [heap.insert(key) for key in keys]
+    results = {}
+
+    def run(name, make_batch, func, after=None, count=rounds):
+        samples = []
+        total_ns = 0
+        total_ops = 0
+        for _ in range(count):
+            args = make_batch()
+            overhead = _overhead(args)
+            elapsed = max(0, _time_batch(func, args) - overhead)
+            total_ns += elapsed
+            total_ops += len(args)
+            samples.append(elapsed / len(args))
+            if after is not None:
+                after(args)
+        results[name] = _summarize(samples, total_ns, total_ops)
+
+    run('FindMin', lambda: [()] * batch, heap.find_min)
+
+    def fresh_key():
+        # Новый ключ не меньше текущего минимума кучи
+        return heap.find_min()[0] + rng.randrange(KEY_RANGE)
+
+    # DecreaseKey по случайным элементам (все они ещё в куче); ключи уменьшаются,
+    # но не ниже текущего минимума
+    current = {}
+
+    def decrease_batch():
+        floor = heap.find_min()[0]
+        args = []
+        for _ in range(batch):
+            i = rng.randrange(n)
+            key = max(floor, current.get(i, keys[i]) - rng.randrange(KEY_RANGE >> 8))
+            current[i] = key
+            args.append((handles[i], key))
+        return args
+
+    run('DecreaseKey', decrease_batch, heap.decrease_key)
+
+    # DeleteMin; после каждого пакета размер кучи восстанавливается вне замера
+    run('DeleteMin', lambda: [()] * batch, heap.delete_min,
+        after=lambda args: [heap.insert(fresh_key()) for _ in args])
+
+    # Insert; после каждого пакета лишние элементы удаляются вне замера
+    run('Insert', lambda: [(fresh_key(),) for _ in range(batch)], heap.insert,
+        after=lambda args: [heap.delete_min() for _ in args])
+
+    # Merge: каждое слияние с новой кучей из batch элементов — отдельная выборка
+    # (пакет из одного вызова; накладные расходы вычитаются так же)
+    def merge_batch():
+        other = heap_cls()
+        for _ in range(batch):
+            other.insert(fresh_key())
+        return [(other,)]
+
+    run('Merge', merge_batch, heap.merge, count=merge_rounds)
+    return results
+
+
+def run_benchmark(sizes=(10**3, 10**4, 10**5, 10**6), batch=20, rounds=500, merge_rounds=100):
+    """Одна команда: замеры всех куч, CSV-файлы и графики *_avg.png / *_max.png."""
+    # исходные столбцы (FindMin/DeleteMin/Insert, Avg/Max) идут первыми
+    fields = [f'{op}_{stat}' for op in OPERATIONS[:3] for stat in ('Avg', 'Max')]
+    fields += [f'{op}_{stat}' for op in OPERATIONS for stat in STATS
+               if f'{op}_{stat}' not in fields]
+    for heap_name, heap_cls in HEAPS.items():
+        prefix = heap_name.replace('Heap', '').lower()
+        rows = []
+        for n in sizes:
+            print(f"{heap_name}: N = {n}")
+            stats = benchmark_heap(heap_cls, n, batch, rounds, merge_rounds)
+            row = {'Heap': heap_name, 'N': n}
+            for op in OPERATIONS:
+                for stat in STATS:
+                    row[f'{op}_{stat}'] = stats[op][stat]
+            rows.append(row)
+        with open(f'{prefix}_heap_results.csv', 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['Heap', 'N'] + fields)
+            writer.writeheader()
+            writer.writerows(rows)
+        for op in OPERATIONS:
+            for stat in ('Avg', 'Max'):
+                field = f'{op}_{stat}'
+                plt.figure(figsize=(8, 6))
+                plt.plot(sizes, [r[field] for r in rows], marker='o')
+                plt.xscale('log')
+                plt.xlabel('N')
+                plt.ylabel('Time per operation (s)')
+                plt.title(f'{heap_name}: {op} ({stat})')
+                plt.grid(True)
+                plt.savefig(f'{prefix}_{op.lower()}_{stat.lower()}.png')
+                plt.close()
+    print("CSV and plots saved")
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -1,9 +1,23 @@
 import hashlib
+import math
 import random
 import string
 import timeit
+from array import array
 import matplotlib.pyplot as plt
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ALPHABET = string.ascii_letters + string.digits
+# Таблица перевода случайных байтов в символы ALPHABET. Байты от BYTE_LIMIT и
+# выше отбрасываются, чтобы символы были равновероятны, как в generate_string
+BYTE_LIMIT = 256 - 256 % len(ALPHABET)
+BYTE_TO_ALPHABET = bytes(ALPHABET.encode()[i % len(ALPHABET)] for i in range(256))
+REJECTED_BYTES = bytes(range(BYTE_LIMIT, 256))
+
 # Генерация случайной строки заданной длины
 def generate_string(length):
     return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
@@ -16,17 +30,56 @@ def modify_string(s, num_changes):
         new_s[idx] = random.choice(string.ascii_letters + string.digits)
     return ''.join(new_s)
 
+# Длина самой длинной общей подпоследовательности бит-параллельным алгоритмом
+# (Allison–Dix / Hyyrö): строка s1 — биты длинного целого, на каждый символ s2
+# приходится несколько операций над целым вместо прохода по строке таблицы
+def lcs_length(s1, s2):
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    m = len(s1)
+    if m == 0:
+        return 0
+    masks = {}
+    for i, ch in enumerate(s1):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    full = (1 << m) - 1
+    v = full
+    for ch in s2:
+        u = v & masks.get(ch, 0)
+        v = ((v + u) | (v - u)) & full
+    # Длина LCS — число нулевых бит в v
+    return m - bin(v).count('1')
+
 # Поиск длины самой длинной общей подпоследовательности
 def longest_common_subsequence(s1, s2):
-    m, n = len(s1), len(s2)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if s1[i - 1] == s2[j - 1]:
-                dp[i][j] = dp[i - 1][j - 1] + 1
+    return lcs_length(s1, s2)
+
+# Последняя строка таблицы LCS для a и b (хранятся только две строки)
+def _lcs_row(a, b):
+    prev = [0] * (len(b) + 1)
+    for ch in a:
+        cur = [0]
+        for j, bj in enumerate(b):
+            if ch == bj:
+                cur.append(prev[j] + 1)
             else:
-                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
-    return dp[m][n]
+                cur.append(max(prev[j + 1], cur[j]))
+        prev = cur
+    return prev
+
+# Сама общая подпоследовательность (алгоритм Хиршберга на двухстрочной таблице,
+# память O(len(s1) + len(s2)))
+def lcs_string(s1, s2):
+    if not s1 or not s2:
+        return ''
+    if len(s1) == 1:
+        return s1 if s1 in s2 else ''
+    mid = len(s1) // 2
+    left = _lcs_row(s1[:mid], s2)
+    right = _lcs_row(s1[mid:][::-1], s2[::-1])
+    n = len(s2)
+    split = max(range(n + 1), key=lambda j: left[j] + right[n - j])
+    return lcs_string(s1[:mid], s2[:split]) + lcs_string(s1[mid:], s2[split:])
 
 # Тест 1: Анализ коллизий
 def test_collisions():
@@ -57,14 +110,111 @@ def generate_hashes(n):
             hashes.add(h)
     return collisions
 
-def test_hash_collisions():
+# Компактное хранилище хешей: сырые digest() MD5, урезанные до первых bits бит,
+# лежат в заранее выделенном непрерывном буфере — array('Q') при bits <= 64,
+# иначе bytearray по 16 байт на хеш. Строки генерируются и хешируются пакетами.
+def generate_digests(n, bits=128, length=256, seed=None, batch=4096):
+    if not 1 <= bits <= 128:
+        raise ValueError("bits must be in range 1..128")
+    rng = random.Random(seed)
+    if bits <= 64:
+        store = array('Q', [0]) * n
+    else:
+        store = bytearray(16 * n)
+    shift = 128 - bits
+    md5 = hashlib.md5
+    i = 0
+    while i < n:
+        count = min(batch, n - i)
+        need = length * count
+        chunk = b''
+        while len(chunk) < need:
+            raw = rng.randbytes((need - len(chunk)) * 256 // BYTE_LIMIT + 16)
+            chunk += raw.translate(BYTE_TO_ALPHABET, REJECTED_BYTES)
+        chunk = memoryview(chunk)
+        for start in range(0, length * count, length):
+            digest = md5(chunk[start:start + length]).digest()
+            if bits <= 64:
+                store[i] = int.from_bytes(digest[:8], 'big') >> (64 - bits)
+            elif shift:
+                value = int.from_bytes(digest, 'big') >> shift << shift
+                store[16 * i:16 * i + 16] = value.to_bytes(16, 'big')
+            else:
+                store[16 * i:16 * i + 16] = digest
+            i += 1
+    return store
+
+# Без NumPy сортировка идёт через sorted() на Python-объектах: ~50 байт на хеш
+# вместо 8-16, поэтому большие N требуют NumPy
+FALLBACK_MAX_DIGESTS = 10**7
+
+def _check_sort_backend(n):
+    if np is None and n > FALLBACK_MAX_DIGESTS:
+        raise RuntimeError(f"counting collisions for n > {FALLBACK_MAX_DIGESTS} digests requires NumPy")
+
+# Количество повторов в хранилище: хеши сортируются, коллизии = n - число различных.
+# С NumPy буфер сортируется по месту (uint64 при bits <= 64, 16-байтовые записи 'S16'
+# иначе), без NumPy — через sorted() (не более FALLBACK_MAX_DIGESTS хешей)
+def count_duplicates(store):
+    if isinstance(store, array):
+        n = len(store)
+        if n == 0:
+            return 0
+        _check_sort_backend(n)
+        if np is not None:
+            values = np.frombuffer(store, dtype=np.uint64)
+            values.sort()
+            return n - 1 - int(np.count_nonzero(values[1:] != values[:-1]))
+        values = sorted(store)
+    else:
+        n = len(store) // 16
+        if n == 0:
+            return 0
+        _check_sort_backend(n)
+        if np is not None:
+            records = np.frombuffer(store, dtype='S16')
+            records.sort()
+            return n - 1 - int(np.count_nonzero(records[1:] != records[:-1]))
+        view = memoryview(store)
+        values = sorted(bytes(view[i:i + 16]) for i in range(0, len(store), 16))
+    unique = 1
+    for prev, cur in zip(values, values[1:]):
+        if prev != cur:
+            unique += 1
+    return n - unique
+
+# Подсчёт коллизий первых bits бит MD5 для n случайных строк
+# (n > FALLBACK_MAX_DIGESTS требует NumPy; проверка до генерации хешей)
+def count_collisions(n, bits=128, length=256, seed=None):
+    _check_sort_backend(n)
+    return count_duplicates(generate_digests(n, bits, length, seed))
+
+# Ожидаемое число коллизий для n случайных bits-битных хешей (парадокс дней рождения)
+def expected_collisions(n, bits):
+    space = 2 ** bits
+    return n + space * math.expm1(n * math.log1p(-1 / space))
+
+def test_hash_collisions(compact=True):
     ns = [10**i for i in range(2, 7)]
     results = {}
     for n in ns:
-        collisions = generate_hashes(n)
+        if compact:
+            collisions = count_collisions(n)
+        else:
+            collisions = generate_hashes(n)
         results[n] = collisions
     return results
 
+# Тест 4: Коллизии урезанного хеша (первые bits бит) против оценки парадокса дней рождения
+# (N больше FALLBACK_MAX_DIGESTS — только с установленным NumPy)
+def test_truncated_collisions(bits=32, ns=None, seed=None):
+    if ns is None:
+        ns = [10**i for i in range(2, 7)]
+    results = {}
+    for n in ns:
+        results[n] = (count_collisions(n, bits, seed=seed), expected_collisions(n, bits))
+    return results
+
 # Тест 3: Анализ времени вычисления
 def measure_hash_time(length, num_trials=1000):
     total_time = 0
@@ -126,6 +276,14 @@ if __name__ == "__main__":
     for length, avg_time in hash_time_results.items():
         print(f"Длина строки: {length}, Среднее время: {avg_time:.6f} сек")
 
+    # Тест 4
+    truncated_results = test_truncated_collisions()
+    print("\nТест 4: Коллизии первых 32 бит MD5:")
+    print("| N генераций | Коллизий | Ожидается |")
+    print("|-------------|----------|-----------|")
+    for n, (collisions, expected) in truncated_results.items():
+        print(f"| {n:<11} | {collisions:<8} | {expected:<9.1f} |")
+
     # Построение графиков
     plot_results(collision_results, hash_time_results)
     print("\nГрафики сохранены как 'collision_analysis.png' и 'hash_time_analysis.png'")
\ No newline at end of file
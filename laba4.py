@@ -1,10 +1,21 @@
 import random
 import time
+import heapq
+from math import isqrt
 import os
 import csv
+import json
+import statistics
+import sys
+import tracemalloc
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from array import array
 import matplotlib.pyplot as plt
 
 def format_time(t):
+    if t != t:  # NaN: замер не удался
+        return "n/a"
     if t < 1e-6:
         return "0s"
     elif t < 1e-3:
@@ -14,56 +25,275 @@ def format_time(t):
     else:
         return f"{t:.4g}s"
 
+class CSRAdjacency:
+    """
+    Список смежности в сжатом формате CSR: соседи вершины v лежат
+    в neighbors[offsets[v]:offsets[v + 1]]. Ведёт себя как словарь adj_list.
+    """
+    __slots__ = ("offsets", "neighbors")
+
+    def __init__(self, offsets, neighbors):
+        self.offsets = offsets
+        self.neighbors = neighbors
+
+    def __getitem__(self, v):
+        return self.neighbors[self.offsets[v]:self.offsets[v + 1]]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def keys(self):
+        return range(len(self))
+
+
 class Graph:
-    def __init__(self, vertices, edges=None, directed=False, edge_list=None):
+    def __init__(self, vertices, edges=None, directed=False, edge_list=None, compact=False, seed=None,
+                 weights=None, max_weight=None):
         """
         Если edge_list задан, то граф создаётся по нему (для демонстрации);
         иначе генерируются случайные ребра (при условии, что edges не None).
+        При compact=True смежность хранится в формате CSR (два массива int),
+        а матрицы смежности и инцидентности строятся только по запросу.
+        seed фиксирует генератор случайных рёбер для воспроизводимости.
+        weights — веса рёбер в порядке edge_list; для случайного графа
+        max_weight задаёт целые веса от 1 до max_weight.
         """
         self.vertices = vertices
         self.directed = directed
-        self.adj_matrix = [[0 for _ in range(vertices)] for _ in range(vertices)]
-        self.adj_list = {i: [] for i in range(vertices)}
+        self.compact = compact
+        self._adj_matrix = None
+        self._inc_matrix = None
+        self._components = None
+        self._zero_one_weights = None
         self.edge_list = []
+        self.edge_weights = None
+        self.adj_weights = None
         if edge_list is not None:
             self.edge_list = edge_list
             self.edges = len(edge_list)
-            for (u, v) in edge_list:
-                if u != v and self.adj_matrix[u][v] == 0:
-                    self.adj_matrix[u][v] = 1
-                    self.adj_list[u].append(v)
-                    if not directed:
-                        self.adj_matrix[v][u] = 1
-                        self.adj_list[v].append(u)
+            if weights is not None:
+                if len(weights) != len(edge_list):
+                    raise ValueError("Число весов не совпадает с числом рёбер")
+                self.edge_weights = list(weights)
+            self.build_adjacency()
         else:
             self.edges = edges if edges is not None else 0
-            self.generate_edges()
-        self.generate_inc_matrix()
-
-    def generate_edges(self):
-        """Генерация случайных рёбер для графа."""
-        edge_count = 0
-        random.seed(time.time_ns())
-        while edge_count < self.edges:
-            u = random.randint(0, self.vertices - 1)
-            v = random.randint(0, self.vertices - 1)
-            if u != v and self.adj_matrix[u][v] == 0:
-                self.adj_matrix[u][v] = 1
-                self.adj_list[u].append(v)
-                self.edge_list.append((u, v))
+            self.generate_edges(seed, max_weight)
+        if not compact:
+            self.generate_inc_matrix()
+
+    @classmethod
+    def from_matrix(cls, matrix, directed=False, compact=True):
+        """Взвешенный граф по матрице весов (0 — нет ребра), например из lab5.generate_graph(..., dense=True)."""
+        n = len(matrix)
+        edge_list = []
+        weights = []
+        for u in range(n):
+            row = matrix[u]
+            for v in range(n if directed else u):
+                if row[v] != 0:
+                    edge_list.append((u, v))
+                    weights.append(row[v])
+        return cls(n, directed=directed, edge_list=edge_list, compact=compact, weights=weights)
+
+    @classmethod
+    def from_adjacency(cls, adj, directed=False, compact=True):
+        """
+        Взвешенный граф по списку смежности [[(v, w), ...], ...], например из
+        lab5.generate_graph, без построения матрицы V×V. В неориентированном
+        случае каждое ребро берётся один раз (из строки большей вершины).
+        """
+        edge_list = []
+        weights = []
+        for u, row in enumerate(adj):
+            for v, w in row:
+                if directed or v < u:
+                    edge_list.append((u, v))
+                    weights.append(w)
+        return cls(len(adj), directed=directed, edge_list=edge_list, compact=compact, weights=weights)
+
+    @property
+    def adj_matrix(self):
+        if self._adj_matrix is None:
+            self.generate_adj_matrix()
+        return self._adj_matrix
+
+    @property
+    def inc_matrix(self):
+        if self._inc_matrix is None:
+            self.generate_inc_matrix()
+        return self._inc_matrix
+
+    @property
+    def weighted(self):
+        return self.edge_weights is not None
+
+    def generate_edges(self, seed=None, max_weight=None):
+        """
+        Генерация случайных рёбер для графа за O(E): выбираем E различных
+        номеров рёбер без возвращения и декодируем их в пары (u, v).
+        """
+        n = self.vertices
+        if self.directed:
+            total = n * (n - 1)
+        else:
+            total = n * (n - 1) // 2
+        if self.edges > total:
+            raise ValueError(f"Граф на {n} вершинах не может содержать {self.edges} рёбер")
+        rng = random.Random(seed)
+        edge_list = []
+        if self.directed:
+            # Номер i -> строка u, столбец v среди n - 1 вершин, отличных от u
+            for i in rng.sample(range(total), self.edges):
+                u, v = divmod(i, n - 1)
+                if v >= u:
+                    v += 1
+                edge_list.append((u, v))
+        else:
+            # Номер i -> пара v < u в нижнем треугольнике матрицы
+            for i in rng.sample(range(total), self.edges):
+                u = (1 + isqrt(8 * i + 1)) // 2
+                v = i - u * (u - 1) // 2
+                edge_list.append((u, v))
+        self.edge_list = edge_list
+        if max_weight is not None:
+            self.edge_weights = [rng.randint(1, max_weight) for _ in range(self.edges)]
+        self.build_adjacency(unique=True)
+
+    def _unique_edges(self):
+        """Рёбра без петель и повторов (с весами, если они есть): первое вхождение побеждает."""
+        n = self.vertices
+        weights = self.edge_weights if self.weighted else [1] * len(self.edge_list)
+        seen = set()
+        edges = []
+        for (u, v), w in zip(self.edge_list, weights):
+            if u == v:
+                continue
+            key = u * n + v if self.directed or u < v else v * n + u
+            if key not in seen:
+                seen.add(key)
+                edges.append((u, v, w))
+        return edges
+
+    def build_adjacency(self, unique=False):
+        """Заполнение структур смежности по списку рёбер одним проходом."""
+        if self.weighted and any(w < 0 for w in self.edge_weights):
+            raise ValueError("Веса рёбер должны быть неотрицательными")
+        if self.compact:
+            self.build_csr(unique)
+            return
+        n = self.vertices
+        self._adj_matrix = [[0 for _ in range(n)] for _ in range(n)]
+        self.adj_list = {i: [] for i in range(n)}
+        adj_matrix = self._adj_matrix
+        adj_list = self.adj_list
+        if self.weighted:
+            self.adj_weights = adj_weights = {i: [] for i in range(n)}
+            for (u, v, w) in self._unique_edges():
+                adj_matrix[u][v] = 1
+                adj_list[u].append(v)
+                adj_weights[u].append(w)
+                if not self.directed:
+                    adj_matrix[v][u] = 1
+                    adj_list[v].append(u)
+                    adj_weights[v].append(w)
+            return
+        for (u, v) in self.edge_list:
+            if u != v and (unique or adj_matrix[u][v] == 0):
+                adj_matrix[u][v] = 1
+                adj_list[u].append(v)
                 if not self.directed:
-                    self.adj_matrix[v][u] = 1
-                    self.adj_list[v].append(u)
-                edge_count += 1
+                    adj_matrix[v][u] = 1
+                    adj_list[v].append(u)
+
+    def build_csr(self, unique=False):
+        """
+        Построение CSR-представления (offsets + neighbors) по списку рёбер за O(V + E).
+        Веса хранятся в параллельном neighbors массиве и доступны через adj_weights.
+        """
+        n = self.vertices
+        if unique and not self.weighted:
+            edges = [(u, v, 1) for (u, v) in self.edge_list]
+        else:
+            edges = self._unique_edges()
+        degree = array('q', bytes(8 * (n + 1)))
+        for (u, v, _) in edges:
+            degree[u + 1] += 1
+            if not self.directed:
+                degree[v + 1] += 1
+        for i in range(n):
+            degree[i + 1] += degree[i]
+        offsets = degree
+        neighbors = array('i', bytes(4 * offsets[n]))
+        weights = None
+        if self.weighted:
+            typecode = 'q' if all(isinstance(w, int) for w in self.edge_weights) else 'd'
+            weights = array(typecode, [0]) * offsets[n]
+        cursor = array('q', offsets[:n])
+        for (u, v, w) in edges:
+            neighbors[cursor[u]] = v
+            if weights is not None:
+                weights[cursor[u]] = w
+            cursor[u] += 1
+            if not self.directed:
+                neighbors[cursor[v]] = u
+                if weights is not None:
+                    weights[cursor[v]] = w
+                cursor[v] += 1
+        self.adj_list = CSRAdjacency(offsets, neighbors)
+        if weights is not None:
+            self.adj_weights = CSRAdjacency(offsets, weights)
+
+    def add_edge(self, u, v, weight=None):
+        """
+        Добавление ребра (u, v) с весом weight (по умолчанию 1 для взвешенного графа).
+        Сбрасывает кэш компонент и ленивые матрицы.
+        В компактном режиме CSR перестраивается целиком, т.е. за O(V + E).
+        Возвращает False, если ребро уже есть или это петля.
+        """
+        if u == v or v in self.adj_list[u]:
+            return False
+        if self.weighted:
+            weight = 1 if weight is None else weight
+            if weight < 0:
+                raise ValueError("Веса рёбер должны быть неотрицательными")
+            self.edge_weights.append(weight)
+        self.edge_list.append((u, v))
+        self.edges += 1
+        if self.compact:
+            self.build_csr()
+            self._adj_matrix = None
+        else:
+            self._adj_matrix[u][v] = 1
+            self.adj_list[u].append(v)
+            if self.weighted:
+                self.adj_weights[u].append(weight)
+            if not self.directed:
+                self._adj_matrix[v][u] = 1
+                self.adj_list[v].append(u)
+                if self.weighted:
+                    self.adj_weights[v].append(weight)
+        self._inc_matrix = None
+        self._components = None
+        self._zero_one_weights = None
+        return True
+
+    def generate_adj_matrix(self):
+        """Генерация матрицы смежности по списку смежности."""
+        self._adj_matrix = [[0 for _ in range(self.vertices)] for _ in range(self.vertices)]
+        for u in self.adj_list.keys():
+            row = self._adj_matrix[u]
+            for v in self.adj_list[u]:
+                row[v] = 1
 
     def generate_inc_matrix(self):
         """Генерация матрицы инцидентности на основе списка рёбер."""
         num_edges = len(self.edge_list)
-        self.inc_matrix = [[0 for _ in range(num_edges)] for _ in range(self.vertices)]
+        self._inc_matrix = [[0 for _ in range(num_edges)] for _ in range(self.vertices)]
         for i, (u, v) in enumerate(self.edge_list):
-            self.inc_matrix[u][i] = 1
+            self._inc_matrix[u][i] = 1
             if not self.directed:
-                self.inc_matrix[v][i] = 1
+                self._inc_matrix[v][i] = 1
 
     def print_adj_matrix(self):
         print("Выдача матрицы смежности:")
@@ -85,24 +315,37 @@ class Graph:
 
     def print_edge_list(self):
         print("Выдача списка ребер:")
+        if self.weighted:
+            for (u, v), w in zip(self.edge_list, self.edge_weights):
+                print(f"{u} - {v} ({w})")
+            return
         for (u, v) in self.edge_list:
             print(f"{u} - {v}")
 
     def BFS(self, start, target):
         """Проверка наличия пути от start до target методом поиска в ширину (BFS)."""
-        visited = [False] * self.vertices
-        queue = [start]
+        if start == target:
+            return True
+        adj_list = self.adj_list
+        visited = bytearray(self.vertices)
+        visited[start] = 1
+        queue = deque([start])
         while queue:
-            node = queue.pop(0)
-            if node == target:
-                return True
-            if not visited[node]:
-                visited[node] = True
-                queue.extend(self.adj_list[node])
+            node = queue.popleft()
+            for neighbor in adj_list[node]:
+                if not visited[neighbor]:
+                    if neighbor == target:
+                        return True
+                    visited[neighbor] = 1
+                    queue.append(neighbor)
         return False
 
     def DFS(self, start, target):
         """Проверка наличия пути от start до target методом поиска в глубину (DFS)."""
+        return self._dfs_path(start, target) is not None
+
+    def DFS_recursive(self, start, target):
+        """Рекурсивный DFS (прежняя реализация, оставлена для сравнения скорости)."""
         visited = [False] * self.vertices
 
         def dfs_recursive(node):
@@ -118,52 +361,367 @@ class Graph:
 
         return dfs_recursive(start)
 
-    def shortest_path_bfs(self, start, target):
-        """Нахождение кратчайшего пути от start до target с использованием BFS."""
+    def reachable_many(self, queries, processes=None):
+        """
+        Пакетная проверка достижимости для списка пар (start, target).
+        Сначала запросы отсекаются по кэшированным компонентам (component_labels),
+        оставшиеся группируются по start и на каждый источник делается один
+        обход. processes > 1 распределяет источники по пулу процессов.
+        Возвращает список bool в порядке запросов.
+        """
+        labels = self.component_labels()
+        if not self.directed:
+            return [labels[start] == labels[target] for (start, target) in queries]
+
+        results = [False] * len(queries)
+        by_source = {}
+        for i, (start, target) in enumerate(queries):
+            if labels[start] == labels[target]:
+                results[i] = True
+            elif labels[target] < labels[start]:
+                by_source.setdefault(start, []).append(i)
+        tasks = [(start, [queries[i][1] for i in idx]) for start, idx in by_source.items()]
+
+        if processes is not None and processes > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(processes, initializer=_init_reach_worker, initargs=(self,)) as pool:
+                chunksize = max(1, len(tasks) // (processes * 4))
+                answers = list(pool.map(_reach_worker, tasks, chunksize=chunksize))
+        else:
+            visited = bytearray(self.vertices)
+            answers = [self._reach_targets(start, targets, visited) for (start, targets) in tasks]
+
+        for idx, flags in zip(by_source.values(), answers):
+            for i, flag in zip(idx, flags):
+                results[i] = flag
+        return results
+
+    def _reach_targets(self, start, targets, visited):
+        """
+        Один BFS из start, отвечающий сразу на все targets; обход прекращается,
+        как только найдены все цели. visited переиспользуется между вызовами
+        и по возвращении снова заполнен нулями.
+        """
+        pending = set(targets)
+        pending.discard(start)
+        adj_list = self.adj_list
+        visited[start] = 1
+        seen = [start]
+        queue = deque(seen)
+        while queue and pending:
+            node = queue.popleft()
+            for neighbor in adj_list[node]:
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    seen.append(neighbor)
+                    queue.append(neighbor)
+                    pending.discard(neighbor)
+        flags = [bool(visited[target]) for target in targets]
+        for node in seen:
+            visited[node] = 0
+        return flags
+
+    def component_labels(self):
+        """
+        Кэшированные метки компонент: компоненты связности (система непересекающихся
+        множеств) для неориентированного графа и компоненты сильной связности
+        (итеративный алгоритм Тарьяна) для ориентированного. Кэш сбрасывается в add_edge.
+        """
+        if self._components is None:
+            if self.directed:
+                self._components = self._tarjan_scc()
+            else:
+                self._components = self._union_find_components()
+        return self._components
+
+    def _union_find_components(self):
+        n = self.vertices
+        parent = array('i', range(n))
+        size = array('i', [1]) * n
+        for (u, v) in self.edge_list:
+            # Поиск корней с сокращением путей вдвое
+            while parent[u] != u:
+                parent[u] = parent[parent[u]]
+                u = parent[u]
+            while parent[v] != v:
+                parent[v] = parent[parent[v]]
+                v = parent[v]
+            if u == v:
+                continue
+            if size[u] < size[v]:
+                u, v = v, u
+            parent[v] = u
+            size[u] += size[v]
+        labels = array('i', [-1]) * n
+        label = 0
+        for x in range(n):
+            root = x
+            while parent[root] != root:
+                root = parent[root]
+            if labels[root] == -1:
+                labels[root] = label
+                label += 1
+            labels[x] = labels[root]
+        return labels
+
+    def _tarjan_scc(self):
+        """
+        Компоненты сильной связности. Номера выдаются в обратном топологическом
+        порядке: если из u достижима v, то labels[v] <= labels[u].
+        """
+        n = self.vertices
+        adj_list = self.adj_list
+        index = array('i', [-1]) * n
+        low = array('i', [0]) * n
+        on_stack = bytearray(n)
+        labels = array('i', [-1]) * n
+        stack = []
+        counter = 0
+        label = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, iter(adj_list[root]))]
+            while work:
+                node, neighbors = work[-1]
+                for w in neighbors:
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        work.append((w, iter(adj_list[w])))
+                        break
+                    if on_stack[w] and index[w] < low[node]:
+                        low[node] = index[w]
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        if low[node] < low[parent]:
+                            low[parent] = low[node]
+                    if low[node] == index[node]:
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = 0
+                            labels[w] = label
+                            if w == node:
+                                break
+                        label += 1
+        return labels
+
+    def is_reachable(self, start, target):
+        """
+        Проверка достижимости через индекс компонент: O(1) для неориентированного
+        графа; для ориентированного O(1) в очевидных случаях, иначе BFS.
+        """
+        labels = self.component_labels()
+        if labels[start] == labels[target]:
+            return True
+        if not self.directed or labels[target] > labels[start]:
+            return False
+        return self.BFS(start, target)
+
+    def _unreachable_by_index(self, start, target):
+        """True, если уже построенный индекс компонент доказывает отсутствие пути."""
+        labels = self._components
+        if labels is None:
+            return False
+        if self.directed:
+            return labels[target] > labels[start]
+        return labels[target] != labels[start]
+
+    def _dfs_path(self, start, target):
+        """
+        DFS на явном стеке итераторов соседей: вершины обходятся в том же
+        порядке, что и при рекурсии, но глубина не ограничена стеком вызовов.
+        Возвращает путь от start до target или None.
+        """
+        adj_list = self.adj_list
+        visited = bytearray(self.vertices)
+        visited[start] = 1
+        path = [start]
+        if start == target:
+            return path
+        stack = [iter(adj_list[start])]
+        while stack:
+            for neighbor in stack[-1]:
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    path.append(neighbor)
+                    if neighbor == target:
+                        return path
+                    stack.append(iter(adj_list[neighbor]))
+                    break
+            else:
+                stack.pop()
+                path.pop()
+        return None
+
+    def shortest_path_bfs(self, start, target, bidirectional=False):
+        """
+        Нахождение кратчайшего пути от start до target с использованием BFS.
+        При bidirectional=True для неориентированного графа поиск ведётся
+        одновременно от обоих концов до встречи фронтов.
+        """
         if start == target:
             return [start], True
-        visited = [False] * self.vertices
+        if self._unreachable_by_index(start, target):
+            return None, False
+        if bidirectional and not self.directed:
+            return self._bidirectional_bfs(start, target)
+        adj_list = self.adj_list
         prev = [-1] * self.vertices
-        queue = [start]
-        visited[start] = True
+        prev[start] = start
+        queue = deque([start])
         while queue:
-            node = queue.pop(0)
-            for neighbor in self.adj_list[node]:
-                if not visited[neighbor]:
-                    visited[neighbor] = True
+            node = queue.popleft()
+            for neighbor in adj_list[node]:
+                if prev[neighbor] == -1:
                     prev[neighbor] = node
-                    queue.append(neighbor)
                     if neighbor == target:
-                        path = []
-                        at = target
-                        while at != -1:
-                            path.insert(0, at)
-                            at = prev[at]
+                        return self._reconstruct_path(prev, start, target), True
+                    queue.append(neighbor)
+        return None, False
+
+    def _bidirectional_bfs(self, start, target):
+        """Двунаправленный BFS: на каждом шаге расширяется меньший из двух фронтов."""
+        adj_list = self.adj_list
+        prev_fwd = [-1] * self.vertices
+        prev_bwd = [-1] * self.vertices
+        prev_fwd[start] = start
+        prev_bwd[target] = target
+        frontier_fwd = [start]
+        frontier_bwd = [target]
+        while frontier_fwd and frontier_bwd:
+            forward = len(frontier_fwd) <= len(frontier_bwd)
+            if forward:
+                frontier, prev, other = frontier_fwd, prev_fwd, prev_bwd
+            else:
+                frontier, prev, other = frontier_bwd, prev_bwd, prev_fwd
+            next_frontier = []
+            for node in frontier:
+                for neighbor in adj_list[node]:
+                    if prev[neighbor] != -1:
+                        continue
+                    prev[neighbor] = node
+                    if other[neighbor] != -1:
+                        # Фронты встретились: склеиваем две половины пути
+                        path = self._reconstruct_path(prev_fwd, start, neighbor)
+                        at = neighbor
+                        while at != target:
+                            at = prev_bwd[at]
+                            path.append(at)
                         return path, True
+                    next_frontier.append(neighbor)
+            if forward:
+                frontier_fwd = next_frontier
+            else:
+                frontier_bwd = next_frontier
         return None, False
 
-    def find_path_dfs(self, start, target):
-        """Нахождение (любого) пути от start до target с использованием DFS."""
-        visited = [False] * self.vertices
-        path = []
+    @staticmethod
+    def _reconstruct_path(prev, start, target):
+        """Восстановление пути по массиву предков за O(длины пути)."""
+        path = [target]
+        at = target
+        while at != start:
+            at = prev[at]
+            path.append(at)
+        path.reverse()
+        return path
 
-        def dfs_recursive(node):
-            if visited[node]:
-                return False
-            visited[node] = True
-            path.append(node)
+    def shortest_path_dijkstra(self, start, target):
+        """
+        Кратчайший путь по весам от start до target: (path, distance) или (None, inf).
+        Дейкстра на двоичной куче с остановкой при извлечении target; если все
+        веса равны 0 или 1 — 0-1 BFS на деке. Невзвешенный граф сводится к BFS.
+        """
+        if not self.weighted:
+            path, found = self.shortest_path_bfs(start, target)
+            return (path, len(path) - 1) if found else (None, float('inf'))
+        if start == target:
+            return [start], 0
+        if self._unreachable_by_index(start, target):
+            return None, float('inf')
+        if self._zero_one_weights is None:
+            self._zero_one_weights = all(w == 0 or w == 1 for w in self.edge_weights)
+        if self._zero_one_weights:
+            return self._zero_one_bfs(start, target)
+        adj_list = self.adj_list
+        adj_weights = self.adj_weights
+        inf = float('inf')
+        dist = [inf] * self.vertices
+        prev = [-1] * self.vertices
+        done = bytearray(self.vertices)
+        dist[start] = 0
+        prev[start] = start
+        heap = [(0, start)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if done[node]:
+                continue
             if node == target:
-                return True
-            for neighbor in self.adj_list[node]:
-                if dfs_recursive(neighbor):
-                    return True
-            path.pop()  
-            return False
+                return self._reconstruct_path(prev, start, target), d
+            done[node] = 1
+            for neighbor, w in zip(adj_list[node], adj_weights[node]):
+                nd = d + w
+                if nd < dist[neighbor]:
+                    dist[neighbor] = nd
+                    prev[neighbor] = node
+                    heapq.heappush(heap, (nd, neighbor))
+        return None, inf
 
-        if dfs_recursive(start):
+    def _zero_one_bfs(self, start, target):
+        """0-1 BFS: рёбра веса 0 кладутся в начало дека, веса 1 — в конец."""
+        adj_list = self.adj_list
+        adj_weights = self.adj_weights
+        inf = float('inf')
+        dist = [inf] * self.vertices
+        prev = [-1] * self.vertices
+        done = bytearray(self.vertices)
+        dist[start] = 0
+        prev[start] = start
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if done[node]:
+                continue
+            if node == target:
+                return self._reconstruct_path(prev, start, target), dist[node]
+            done[node] = 1
+            d = dist[node]
+            for neighbor, w in zip(adj_list[node], adj_weights[node]):
+                if d + w < dist[neighbor]:
+                    dist[neighbor] = d + w
+                    prev[neighbor] = node
+                    if w == 0:
+                        queue.appendleft(neighbor)
+                    else:
+                        queue.append(neighbor)
+        return None, inf
+
+    def find_path_dfs(self, start, target):
+        """Нахождение (любого) пути от start до target с использованием DFS."""
+        path = self._dfs_path(start, target)
+        if path is not None:
             return path, True
         return None, False
 
+_reach_graph = None
+
+def _init_reach_worker(graph):
+    """Инициализация процесса пула: граф передаётся один раз на процесс."""
+    global _reach_graph
+    _reach_graph = graph
+
+def _reach_worker(task):
+    start, targets = task
+    return _reach_graph._reach_targets(start, targets, bytearray(_reach_graph.vertices))
+
 def demo_graph_results():
     print("Результаты расчётов:")
     demo_edge_list = [(2,3), (1,0), (2,1), (1,4), (2,0),
@@ -188,11 +746,11 @@ def demo_graph_results():
     print(f"Длина пути (BFS): {len(bfs_path) if bfs_path else 0}")
     print(f"Длина пути (DFS): {len(dfs_path) if dfs_path else 0}")
 
-def run_performance_test(test_name, vertices_list, edge_multiplier, directed=False):
-    results = []  # каждый элемент: (V, E, DFS_time, BFS_time)
+def run_performance_test(test_name, vertices_list, edge_multiplier, directed=False, seed=None):
+    results = []  # каждый элемент: (V, E, DFS_time, BFS_time, DFS_recursive_time)
     for V in vertices_list:
         E = V * edge_multiplier
-        graph = Graph(V, edges=E, directed=directed)
+        graph = Graph(V, edges=E, directed=directed, seed=seed)
         start, target = 0, V - 1
 
         t1 = time.perf_counter_ns()
@@ -205,23 +763,157 @@ def run_performance_test(test_name, vertices_list, edge_multiplier, directed=Fal
         t2 = time.perf_counter_ns()
         bfs_time = (t2 - t1) / 1e9
 
-        results.append((V, E, dfs_time, bfs_time))
+        # Рекурсивная версия упирается в лимит рекурсии на глубоких графах
+        try:
+            t1 = time.perf_counter_ns()
+            graph.DFS_recursive(start, target)
+            t2 = time.perf_counter_ns()
+            dfs_rec_time = (t2 - t1) / 1e9
+        except RecursionError:
+            dfs_rec_time = float('nan')
+
+        results.append((V, E, dfs_time, bfs_time, dfs_rec_time))
     print(f"\n{test_name}:")
-    print("V, E, DFS, BFS")
-    for (V, E, dfs_t, bfs_t) in results:
-        print(f"{V},{E},{format_time(dfs_t)},{format_time(bfs_t)}")
+    print("V, E, DFS, BFS, DFS (рекурсивный)")
+    for (V, E, dfs_t, bfs_t, dfs_rec_t) in results:
+        print(f"{V},{E},{format_time(dfs_t)},{format_time(bfs_t)},{format_time(dfs_rec_t)}")
     return results
 
+def run_chain_test(lengths):
+    """Сравнение итеративного и рекурсивного DFS на графе-цепочке 0 - 1 - ... - (V-1)."""
+    print("\nЦепочка: V, DFS, DFS (рекурсивный)")
+    for V in lengths:
+        graph = Graph(V, edge_list=[(i, i + 1) for i in range(V - 1)], compact=True)
+
+        t1 = time.perf_counter_ns()
+        graph.DFS(0, V - 1)
+        t2 = time.perf_counter_ns()
+        dfs_time = (t2 - t1) / 1e9
+
+        try:
+            t1 = time.perf_counter_ns()
+            graph.DFS_recursive(0, V - 1)
+            t2 = time.perf_counter_ns()
+            dfs_rec_time = (t2 - t1) / 1e9
+        except RecursionError:
+            dfs_rec_time = float('nan')
+        print(f"{V},{format_time(dfs_time)},{format_time(dfs_rec_time)}")
+
+def percentile(sorted_values, q):
+    """Перцентиль q (0..100) отсортированной выборки с линейной интерполяцией."""
+    if not sorted_values:
+        return float('nan')
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+def summarize(samples):
+    """Сводная статистика по замерам в секундах."""
+    values = sorted(samples)
+    return {
+        "runs": len(values),
+        "min_s": values[0],
+        "median_s": statistics.median(values),
+        "mean_s": statistics.fmean(values),
+        "p95_s": percentile(values, 95),
+    }
+
+def peak_memory(func, *args, **kwargs):
+    """Пиковый объём памяти (байт), выделенной при вызове func, по tracemalloc."""
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_benchmark(test_name, vertices_list, edge_multiplier, directed=False, compact=False,
+                  repeats=5, warmups=1, pairs=20, seed=0):
+    """
+    Бенчмарк построения графа и обходов. Для каждого V граф строится
+    warmups + repeats раз, обходы DFS/BFS/shortest_path_bfs запускаются на
+    pairs случайных пар (start, target) в каждом повторе. Тёплые прогоны
+    отбрасываются; память меряется отдельным прогоном под tracemalloc.
+    Возвращает список словарей с числовыми полями.
+    """
+    rng = random.Random(seed)
+    records = []
+    for V in vertices_list:
+        E = V * edge_multiplier
+        graph_seed = rng.randrange(2**32)
+
+        build_times = []
+        for r in range(warmups + repeats):
+            t1 = time.perf_counter_ns()
+            graph = Graph(V, edges=E, directed=directed, compact=compact, seed=graph_seed)
+            t2 = time.perf_counter_ns()
+            if r >= warmups:
+                build_times.append((t2 - t1) / 1e9)
+        build_mem = peak_memory(Graph, V, edges=E, directed=directed, compact=compact, seed=graph_seed)
+        base = {"test": test_name, "vertices": V, "edges": E, "directed": directed, "compact": compact}
+        records.append({**base, "operation": "build", **summarize(build_times), "peak_memory_bytes": build_mem})
+
+        queries = [(rng.randrange(V), rng.randrange(V)) for _ in range(pairs)]
+        operations = [("DFS", graph.DFS), ("BFS", graph.BFS), ("shortest_path_bfs", graph.shortest_path_bfs)]
+        for name, op in operations:
+            samples = []
+            for r in range(warmups + repeats):
+                for (start, target) in queries:
+                    t1 = time.perf_counter_ns()
+                    op(start, target)
+                    t2 = time.perf_counter_ns()
+                    if r >= warmups:
+                        samples.append((t2 - t1) / 1e9)
+            mem = max(peak_memory(op, start, target) for (start, target) in queries)
+            records.append({**base, "operation": name, **summarize(samples), "peak_memory_bytes": mem})
+    return records
+
+BENCHMARK_FIELDS = ["test", "vertices", "edges", "directed", "compact", "operation",
+                    "runs", "min_s", "median_s", "mean_s", "p95_s", "peak_memory_bytes"]
+
+def write_benchmark_csv(records, filename):
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=BENCHMARK_FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+def write_benchmark_json(records, filename):
+    with open(filename, "w") as f:
+        json.dump(records, f, indent=2)
+
+def print_benchmark(records):
+    print("test, V, E, operation, median, p95, min, peak memory")
+    for r in records:
+        print(f"{r['test']},{r['vertices']},{r['edges']},{r['operation']},"
+              f"{format_time(r['median_s'])},{format_time(r['p95_s'])},{format_time(r['min_s'])},"
+              f"{r['peak_memory_bytes'] / 1024:.1f}KiB")
+
+def benchmark_main(repeats=5, warmups=1, pairs=20, seed=0, compact=False):
+    """Полный набор бенчмарков; результаты пишутся в benchmark.csv и benchmark.json."""
+    records = []
+    records += run_benchmark("Test1", list(range(100, 1001, 100)), 20, False, compact, repeats, warmups, pairs, seed)
+    records += run_benchmark("Test2", list(range(100, 1001, 100)), 20, True, compact, repeats, warmups, pairs, seed)
+    records += run_benchmark("Test3", list(range(10, 101, 10)), 2, False, compact, repeats, warmups, pairs, seed)
+    records += run_benchmark("Test4", list(range(10, 101, 10)), 2, True, compact, repeats, warmups, pairs, seed)
+    print_benchmark(records)
+    write_benchmark_csv(records, "benchmark.csv")
+    write_benchmark_json(records, "benchmark.json")
+    print("\nРезультаты бенчмарка записаны в benchmark.csv и benchmark.json")
+    return records
+
 def plot_performance(test_name, results):
     vertices = [r[0] for r in results]
     dfs_times = [r[2] for r in results]
     bfs_times = [r[3] for r in results]
+    dfs_rec_times = [r[4] for r in results]
     plt.figure(figsize=(8, 6))
     plt.title(f"BFS vs DFS Execution Times ({test_name})")
     plt.xlabel("Number of Vertices")
     plt.ylabel("Time (s)")
     plt.plot(vertices, dfs_times, color='blue', marker='o', label='DFS')
     plt.plot(vertices, bfs_times, color='red', marker='o', label='BFS')
+    plt.plot(vertices, dfs_rec_times, color='green', marker='o', label='DFS (recursive)')
     plt.legend()
     filename = f"results_{test_name}.png"
     plt.savefig(filename)
@@ -247,15 +939,20 @@ def main():
     res4 = run_performance_test("Test4", vertices_test4, edge_multiplier=2, directed=True)
     plot_performance("Test4", res4)
 
+    run_chain_test([10**3, 10**4, 10**5, 10**6])
+
     csv_filename = "performance.csv"
     with open(csv_filename, "w", newline="") as f:
         writer = csv.writer(f)
-        writer.writerow(["Test", "Vertices", "Edges", "DFS_time", "BFS_time"])
+        writer.writerow(["Test", "Vertices", "Edges", "DFS_time", "BFS_time", "DFS_recursive_time"])
         for test_name, res in zip(["Test1", "Test2", "Test3", "Test4"], [res1, res2, res3, res4]):
-            for (V, E, dfs_t, bfs_t) in res:
-                writer.writerow([test_name, V, E, format_time(dfs_t), format_time(bfs_t)])
+            for (V, E, dfs_t, bfs_t, dfs_rec_t) in res:
+                writer.writerow([test_name, V, E, dfs_t, bfs_t, dfs_rec_t])
     print(f"\nРезультаты замеров записаны в {csv_filename}")
 
 if __name__ == "__main__":
-    main()
+    if "--bench" in sys.argv:
+        benchmark_main(compact="--compact" in sys.argv)
+    else:
+        main()
 